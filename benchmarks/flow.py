@@ -0,0 +1,194 @@
+"""
+Per-step latency benchmark of the search → result → playback flow.
+
+Runs the flow N times against the local stand-in (core.standin) and writes
+p50/p95/p99 per step, WebDriver command counts and total time to JSON:
+
+    python -m benchmarks.flow --runs 20 --out output/bench.json
+    python -m benchmarks.flow --runs 20 --compare output/bench_baseline.json
+
+With --compare, exits 1 if any step's p50 or p95 regressed by more than --threshold.
+--triage runs with failure-triage capture on (core.triage), to measure what it costs a
+passing test:
+
+    python -m benchmarks.flow --runs 20 --out output/bench_plain.json
+    python -m benchmarks.flow --runs 20 --triage --compare output/bench_plain.json --threshold 0.05
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+
+from core import config
+from core.driver_pool import DriverPool
+from core.driver_setup import create_mobile_driver
+from core.instrumentation import CommandRecorder
+from core.standin import StandinServer
+from core.triage import TriageBuffer
+from screens.home_screen import HomeScreen
+from screens.search_screen import SearchScreen
+from screens.streamer_screen import StreamerScreen
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile; values need not be sorted."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil without math
+    return ordered[int(rank) - 1]
+
+
+def summarize(values):
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "mean": round(sum(values) / len(values), 2) if values else None,
+        "min": min(values) if values else None,
+        "max": max(values) if values else None,
+    }
+
+
+def run_flow(driver, base_url, term, recorder):
+    """One iteration. Returns {step: (ms, commands)}."""
+    home = HomeScreen(driver)
+    search = SearchScreen(driver)
+    stream = StreamerScreen(driver)
+    steps = (
+        ("open_home", lambda: home.open(base_url)),
+        ("tap_search", home.tap_search_icon),
+        ("enter_query", lambda: search.enter_query(term)),
+        ("scroll_down_twice", search.scroll_down_twice),
+        ("open_first_result", search.open_first_result),
+        ("dismiss_popups", stream.dismiss_popups_if_any),
+        ("wait_until_loaded", stream.wait_until_loaded),
+        ("try_start_playback", stream.try_start_playback),
+    )
+    out = {}
+    for name, action in steps:
+        before = len(recorder.commands)
+        start = time.perf_counter()
+        action()
+        out[name] = (round((time.perf_counter() - start) * 1000, 1), len(recorder.commands) - before)
+    return out
+
+
+def _git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+
+def benchmark(runs, term, base_url=None, latency_ms=0, triage=False):
+    server = None
+    if base_url is None:
+        server = StandinServer(latency_ms=latency_ms).start()
+        base_url = server.url
+
+    pool = DriverPool(config.DEVICE_NAME, max_uses=runs + 1,
+                      factory=partial(create_mobile_driver, capture_logs=triage))
+    step_ms, step_cmds, totals = {}, {}, []
+    try:
+        for i in range(runs):
+            driver = pool.acquire()
+            recorder = CommandRecorder(driver).attach()
+            # Wraps the recorder, so its drains show up in the command counts too
+            buffer = TriageBuffer(driver).start() if triage else None
+            try:
+                result = run_flow(driver, base_url, term, recorder)
+            finally:
+                if buffer:
+                    buffer.discard()  # what a passing test does
+                recorder.detach()
+                pool.release(driver)
+            for name, (ms, cmds) in result.items():
+                step_ms.setdefault(name, []).append(ms)
+                step_cmds.setdefault(name, []).append(cmds)
+            totals.append(round(sum(ms for ms, _ in result.values()), 1))
+            print(f"[BENCH] run {i + 1}/{runs}: {totals[-1]:.0f} ms")
+    finally:
+        pool.close()
+        if server:
+            server.stop()
+
+    return {
+        "meta": {
+            "revision": _git_rev(),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "runs": runs,
+            "term": term,
+            "target": "standin" if server else base_url,
+            "latency_ms": latency_ms if server else None,
+            "device": config.DEVICE_NAME,
+            "triage": triage,
+        },
+        "steps": {
+            name: {**summarize(values), "commands": summarize(step_cmds[name])}
+            for name, values in step_ms.items()
+        },
+        "total": summarize(totals),
+    }
+
+
+def compare(current, baseline, threshold):
+    """Return human-readable regressions (empty list when within threshold)."""
+    regressions = []
+    rows = [(name, stats, baseline["steps"].get(name)) for name, stats in current["steps"].items()]
+    rows.append(("TOTAL", current["total"], baseline.get("total")))
+    for name, cur, base in rows:
+        if not base:
+            continue
+        for key in ("p50", "p95"):
+            if base[key] and cur[key] and cur[key] > base[key] * (1 + threshold):
+                regressions.append(f"{name} {key}: {base[key]:.0f} ms -> {cur[key]:.0f} ms "
+                                   f"(+{(cur[key] / base[key] - 1) * 100:.0f}%)")
+    return regressions
+
+
+def _print_table(result):
+    print(f"\n{'step':<20} {'p50':>8} {'p95':>8} {'p99':>8} {'cmds(p50)':>10}")
+    for name, s in result["steps"].items():
+        print(f"{name:<20} {s['p50']:>8.0f} {s['p95']:>8.0f} {s['p99']:>8.0f} {s['commands']['p50']:>10}")
+    t = result["total"]
+    print(f"{'TOTAL':<20} {t['p50']:>8.0f} {t['p95']:>8.0f} {t['p99']:>8.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the search-to-playback flow")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--term", default=config.SEARCH_TERM)
+    parser.add_argument("--base-url", default=None, help="Target site (default: local stand-in)")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Stand-in injected latency")
+    parser.add_argument("--out", default=str(Path(config.OUTPUT_DIR) / "bench.json"))
+    parser.add_argument("--compare", default=None, help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown (0.2 = 20%%)")
+    parser.add_argument("--triage", action="store_true", help="Run with failure-triage capture enabled")
+    args = parser.parse_args()
+
+    result = benchmark(args.runs, args.term, args.base_url, args.latency_ms, triage=args.triage)
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    _print_table(result)
+    print(f"\nResults written to {out}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(result, baseline, args.threshold)
+        if regressions:
+            print(f"\nREGRESSIONS vs {baseline['meta'].get('revision')}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions vs {baseline['meta'].get('revision')} (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""
+Soak / leak test: loop the search → result → playback flow in ONE browser for a
+duration or iteration count, sampling JS heap, DOM nodes, Chrome RSS and per-iteration
+latency, then flag any metric whose linear trend grows past a threshold.
+
+    python -m benchmarks.soak --duration 2h
+    python -m benchmarks.soak --iterations 500 --threshold 0.15 --out output/soak.json
+
+Runs against the local stand-in by default (--base-url to point elsewhere).
+Exits 1 when a leak or slowdown is flagged.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from core import config
+from core.driver_setup import create_mobile_driver
+from core.instrumentation import CommandRecorder
+from core.perf_capture import cdp_metrics
+from core.standin import StandinServer
+from benchmarks.flow import run_flow
+
+# Metrics checked for upward trends
+_TRENDED = ("latency_ms", "js_heap_used_bytes", "dom_nodes", "chrome_rss_bytes")
+
+
+def _parse_duration(text):
+    """'90s', '30m', '2h' or plain seconds → seconds."""
+    m = re.fullmatch(r"(\d+(?:\.\d+)?)([smh]?)", text.strip())
+    if not m:
+        raise argparse.ArgumentTypeError(f"Bad duration: {text!r}")
+    return float(m.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[m.group(2)]
+
+
+def _children(pid):
+    """All descendant pids (psutil when installed, /proc on Linux, else none)."""
+    try:
+        import psutil
+        return [p.pid for p in psutil.Process(pid).children(recursive=True)]
+    except ImportError:
+        pass
+    except Exception:
+        return []
+    if not os.path.isdir("/proc"):
+        return []
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+                parents.setdefault(ppid, []).append(int(entry))
+            except Exception:
+                continue
+    out, stack = [], [pid]
+    while stack:
+        for child in parents.get(stack.pop(), []):
+            out.append(child)
+            stack.append(child)
+    return out
+
+
+def _rss(pid):
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+    except ImportError:
+        pass
+    except Exception:
+        return 0
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return 0
+
+
+def chrome_rss(driver):
+    """Resident memory of every process under chromedriver (Chrome browser, renderers, GPU)."""
+    try:
+        root = driver.service.process.pid
+    except Exception:
+        return None
+    pids = _children(root)
+    return sum(_rss(p) for p in pids) or None
+
+
+def slope(ys):
+    """Least-squares slope of ys against their index."""
+    n = len(ys)
+    if n < 2:
+        return 0.0
+    mean_x, mean_y = (n - 1) / 2, sum(ys) / n
+    num = sum((i - mean_x) * (y - mean_y) for i, y in enumerate(ys))
+    den = sum((i - mean_x) ** 2 for i in range(n))
+    return num / den
+
+
+def analyze(samples, threshold, warmup):
+    """
+    For each metric, fit a line over post-warm-up samples and compare the fitted growth
+    across the run with the fitted starting value. Growth above `threshold` is flagged.
+    Failed iterations stop early, so their latency is left out of the trend.
+    """
+    findings = {}
+    steady = samples[warmup:] if len(samples) > warmup + 2 else samples
+    for key in _TRENDED:
+        ys = [s[key] for s in steady
+              if s.get(key) is not None and not (key == "latency_ms" and s.get("error"))]
+        if len(ys) < 3:
+            continue
+        k = slope(ys)
+        start = sum(ys) / len(ys) - k * (len(ys) - 1) / 2  # fitted value at the first sample
+        growth = (k * (len(ys) - 1)) / start if start else 0.0
+        findings[key] = {
+            "start": round(start, 1), "slope_per_iter": round(k, 3),
+            "growth": round(growth, 3), "flagged": growth > threshold,
+        }
+    return findings
+
+
+def error_rate(samples):
+    return sum(1 for s in samples if s.get("error")) / len(samples) if samples else 0.0
+
+
+def soak(base_url, term, iterations=None, duration_s=None, gc=True):
+    driver = create_mobile_driver(config.DEVICE_NAME)
+    recorder = CommandRecorder(driver).attach()
+    samples = []
+    started = time.perf_counter()
+    try:
+        driver.execute_cdp_cmd("Performance.enable", {})
+        i = 0
+        while True:
+            if iterations is not None and i >= iterations:
+                break
+            if duration_s is not None and time.perf_counter() - started >= duration_s:
+                break
+            t0 = time.perf_counter()
+            error = None
+            try:
+                run_flow(driver, base_url, term, recorder)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"[:200]
+            latency = round((time.perf_counter() - t0) * 1000, 1)
+            recorder.reset()  # keep memory flat on multi-hour runs
+
+            if gc:
+                try:
+                    driver.execute_cdp_cmd("HeapProfiler.collectGarbage", {})
+                except Exception:
+                    pass
+            sample = {"iteration": i, "t_s": round(time.perf_counter() - started, 1),
+                      "latency_ms": latency, "error": error,
+                      **cdp_metrics(driver), "chrome_rss_bytes": chrome_rss(driver)}
+            samples.append(sample)
+            heap = (sample.get("js_heap_used_bytes") or 0) / 1e6
+            rss = (sample.get("chrome_rss_bytes") or 0) / 1e6
+            print(f"[SOAK] #{i} {latency:.0f} ms heap={heap:.1f}MB nodes={sample.get('dom_nodes')} "
+                  f"rss={rss:.0f}MB{' ERROR ' + error if error else ''}")
+            i += 1
+    finally:
+        recorder.detach()
+        driver.quit()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak the search-to-playback flow and look for leaks")
+    parser.add_argument("--iterations", type=int, default=None)
+    parser.add_argument("--duration", type=_parse_duration, default=None, help="e.g. 30m, 2h")
+    parser.add_argument("--term", default=config.SEARCH_TERM)
+    parser.add_argument("--base-url", default=None, help="Target site (default: local stand-in)")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Flag a metric whose fitted growth over the run exceeds this fraction")
+    parser.add_argument("--warmup", type=int, default=5, help="Iterations ignored by the trend analysis")
+    parser.add_argument("--max-error-rate", type=float, default=0.0,
+                        help="Fail when more than this fraction of iterations errored (default: any)")
+    parser.add_argument("--no-gc", action="store_true", help="Do not force GC before heap samples")
+    parser.add_argument("--out", default=str(Path(config.OUTPUT_DIR) / "soak.json"))
+    args = parser.parse_args()
+    if args.iterations is None and args.duration is None:
+        args.iterations = 100
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = StandinServer().start()
+        base_url = server.url
+    try:
+        samples = soak(base_url, args.term, args.iterations, args.duration, gc=not args.no_gc)
+    finally:
+        if server:
+            server.stop()
+
+    findings = analyze(samples, args.threshold, args.warmup)
+    errors = error_rate(samples)
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"threshold": args.threshold, "error_rate": round(errors, 3),
+                               "findings": findings, "samples": samples}, indent=2), encoding="utf-8")
+
+    print(f"\n{'metric':<20} {'start':>14} {'slope/iter':>12} {'growth':>8}")
+    for key, f in findings.items():
+        flag = "  <-- LEAK/SLOWDOWN" if f["flagged"] else ""
+        print(f"{key:<20} {f['start']:>14.0f} {f['slope_per_iter']:>12.1f} {f['growth']:>7.0%}{flag}")
+    failed = sum(1 for s in samples if s.get("error"))
+    print(f"\n{len(samples)} iterations, {failed} failed ({errors:.0%}); samples written to {out}")
+    if errors > args.max_error_rate:
+        print(f"FAILED: error rate {errors:.0%} exceeds --max-error-rate {args.max_error_rate:.0%}")
+        return 1
+    return 1 if any(f["flagged"] for f in findings.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
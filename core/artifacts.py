@@ -0,0 +1,110 @@
+"""
+Non-blocking screenshot pipeline.
+
+Screenshots are taken as base64 through CDP `Page.captureScreenshot`, which lets Chrome
+do the encoding (PNG/JPEG/WebP) and downscaling (`clip.scale`). Decoding and writing the
+file happen on a background thread pool, so tests and teardown never wait on disk I/O;
+`flush()` at session end makes sure everything is on disk.
+"""
+import atexit
+import base64
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+
+from core import config
+
+log = logging.getLogger(__name__)
+
+_MIME = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+
+
+def capture_screenshot(driver, fmt="png", quality=None, scale=1.0):
+    """
+    Return (base64_data, fmt) for the current viewport.
+    `scale` < 1 produces a thumbnail rendered at that size by Chrome.
+    Falls back to a plain WebDriver PNG screenshot when CDP is unavailable.
+    """
+    params = {"format": fmt}
+    if quality is not None and fmt != "png":
+        params["quality"] = quality
+    try:
+        if scale != 1.0:
+            vp = driver.execute_cdp_cmd("Page.getLayoutMetrics", {})["cssVisualViewport"]
+            params["clip"] = {"x": vp["pageX"], "y": vp["pageY"], "width": vp["clientWidth"],
+                              "height": vp["clientHeight"], "scale": scale}
+        return driver.execute_cdp_cmd("Page.captureScreenshot", params)["data"], fmt
+    except Exception as e:
+        log.debug("CDP screenshot failed (%s); using WebDriver screenshot", e)
+        return driver.get_screenshot_as_base64(), "png"
+
+
+def mime_type(fmt):
+    return _MIME.get(fmt, "image/png")
+
+
+def _with_format(path, fmt):
+    """`path` with the image extension for `fmt`: an existing image extension is replaced,
+    anything else is kept (failure names such as 'test_x.py__test_y_<ts>' contain dots)."""
+    path = Path(path)
+    if path.suffix.lower().lstrip(".") in (*_MIME, "jpg"):
+        return path.with_suffix(f".{fmt}")
+    return path.with_name(f"{path.name}.{fmt}")
+
+
+def _write(path, data_b64):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".part")
+    tmp.write_bytes(base64.b64decode(data_b64))
+    tmp.replace(path)  # readers never see a half-written image
+    return path
+
+
+class ArtifactWriter:
+    def __init__(self, workers=None):
+        self._pool = ThreadPoolExecutor(max_workers=workers or config.ARTIFACT_WORKERS,
+                                        thread_name_prefix="artifacts")
+        self._pending = set()
+
+    def submit(self, path, data_b64):
+        """Queue a base64 payload to be decoded and written to `path`. Returns a Future."""
+        return self.submit_task(_write, path, data_b64)
+
+    def submit_task(self, fn, *args):
+        """Run any artifact-producing callable in the background; flushed like screenshots."""
+        future = self._pool.submit(fn, *args)
+        self._pending.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        self._pending.discard(future)
+        if future.exception():
+            log.warning("Artifact write failed: %s", future.exception())
+
+    def save_screenshot(self, driver, path, fmt=None, quality=None):
+        """Capture now, write in the background. Returns (Future, base64_data)."""
+        fmt = fmt or config.ARTIFACT_IMAGE_FORMAT
+        data, fmt = capture_screenshot(driver, fmt=fmt, quality=quality or config.ARTIFACT_IMAGE_QUALITY)
+        path = _with_format(path, fmt)
+        return self.submit(path, data), data
+
+    def flush(self, timeout=None):
+        wait(list(self._pending), timeout=timeout)
+
+    def close(self):
+        self.flush()
+        self._pool.shutdown(wait=True)
+
+
+_writer = None
+
+
+def get_artifact_writer():
+    """Process-wide writer; flushed at interpreter exit as a safety net."""
+    global _writer
+    if _writer is None:
+        _writer = ArtifactWriter()
+        atexit.register(_writer.close)
+    return _writer
@@ -0,0 +1,63 @@
+import logging
+
+from core.settle import install_settle_tracker
+
+log = logging.getLogger(__name__)
+
+
+class BrowserContext:
+    """
+    A fresh, incognito-like browser context (own cookies, storage and cache) inside the
+    running Chrome, created over CDP. Opening one takes milliseconds versus seconds for a
+    browser launch. The driver is switched to a tab in the new context until close().
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.context_id = None
+        self.target_id = None
+        self._previous_handle = None
+
+    def open(self):
+        drv = self.driver
+        self._previous_handle = drv.current_window_handle
+        self.context_id = drv.execute_cdp_cmd(
+            "Target.createBrowserContext", {"disposeOnDetach": True}
+        )["browserContextId"]
+        try:
+            self.target_id = drv.execute_cdp_cmd(
+                "Target.createTarget", {"url": "about:blank", "browserContextId": self.context_id}
+            )["targetId"]
+            # ChromeDriver window handles are CDP target ids
+            drv.switch_to.window(self.target_id)
+            # Per-target CDP state does not carry over from the old tab
+            install_settle_tracker(drv)
+        except Exception:
+            self.close()  # do not leave a half-open context behind
+            raise
+        return self
+
+    def close(self):
+        drv = self.driver
+        if self.context_id is None:
+            return
+        try:
+            if self.target_id and self.target_id in drv.window_handles:
+                drv.switch_to.window(self.target_id)
+                drv.close()
+        except Exception as e:
+            log.debug("Context tab already gone: %s", e)
+        try:
+            drv.switch_to.window(self._previous_handle)
+        except Exception:
+            try:
+                handles = drv.window_handles
+                if handles:
+                    drv.switch_to.window(handles[0])
+            except Exception as e:
+                log.debug("No window to switch back to: %s", e)  # the pool's liveness check decides
+        try:
+            drv.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": self.context_id})
+        except Exception as e:
+            log.debug("Browser context %s not disposed: %s", self.context_id, e)
+        self.context_id = self.target_id = None
@@ -0,0 +1,52 @@
+"""
+Single reader for ChromeDriver's `browser` (console) and `performance` (CDP events) logs.
+
+`driver.get_log()` drains ChromeDriver's buffer, so two consumers reading it directly
+would each see only part of the events. core.triage and core.perf_capture subscribe
+here instead and every drained batch is handed to all of them.
+
+The logs only exist for drivers launched with `create_mobile_driver(..., capture_logs=True)`.
+"""
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class ChromeLogs:
+    def __init__(self, driver):
+        self.driver = driver
+        self.available = True
+        self._subscribers = {"browser": [], "performance": []}
+
+    def subscribe(self, log_type, fn):
+        """`fn(entries)` is called with every batch of `log_type` entries drained from now on."""
+        self._subscribers[log_type].append(fn)
+
+    def unsubscribe(self, log_type, fn):
+        if fn in self._subscribers[log_type]:
+            self._subscribers[log_type].remove(fn)
+
+    def drain(self):
+        """One get_log round trip per log type somebody listens to."""
+        if not self.available:
+            return
+        for log_type, subscribers in self._subscribers.items():
+            if not subscribers:
+                continue
+            try:
+                entries = self.driver.get_log(log_type)
+            except Exception as e:
+                # Driver launched without capture_logs
+                log.debug("ChromeDriver %s log unavailable: %s", log_type, e)
+                self.available = False
+                return
+            for fn in list(subscribers):
+                fn(entries)
+
+
+def chrome_logs(driver):
+    """The driver's shared log reader (created on first use)."""
+    reader = getattr(driver, "_chrome_logs", None)
+    if reader is None:
+        reader = driver._chrome_logs = ChromeLogs(driver)
+    return reader
@@ -1,13 +1,116 @@
+import os
 
+BASE_URL = os.getenv("TWITCH_BASE_URL", "https://m.twitch.tv/")  # `pytest --standin` points it at core.standin
+SEARCH_TERM = "StarCraft II"
+DEVICE_NAME = "iPhone 12 Pro"
+IMPLICIT_WAIT = 0
+PAGELOAD_TIMEOUT = 45
+OUTPUT_DIR = "output"
+SCREENSHOT_PATH = "output/final_view.png"  # under xdist the file lands in output/<worker>/
 
+# Driver pool: warm browsers are reused across tests and recycled after N checkouts
+POOL_MAX_USES = 20
+# Test isolation on a pooled browser: "reset" (clear cookies/storage/tabs) or
+# "context" (fresh CDP browser context per test, disposed on teardown)
+ISOLATION = os.getenv("ISOLATION", "reset")
 
+# Resolved chromedriver binaries are cached here, one folder per Chrome major version
+CHROMEDRIVER_CACHE_DIR = os.getenv("CHROMEDRIVER_CACHE_DIR", "~/.cache/twitch_mobile/chromedriver")
 
+# Step runner (core.steps): per-step timeout / retries, total budget per test flow,
+# and the decayed pass/flaky history used for flakiness scoring (`python -m core.steps`)
+STEP_TIMEOUT = 30
+STEP_RETRIES = 1
+STEP_BUDGET_S = float(os.getenv("STEP_BUDGET_S", "180"))
+STEP_HISTORY_PATH = os.getenv("STEP_HISTORY_PATH", ".cache/step_history.json")
+STEP_HISTORY_DECAY = 0.3
 
+# Warm-start profile (core.profile_snapshot, `pytest --warm-profile`): a golden user-data-dir
+# with consent and caches primed, cloned per browser launch and rebuilt after this many hours
+PROFILE_SNAPSHOT_DIR = os.getenv("PROFILE_SNAPSHOT_DIR", ".cache/chrome_profile/golden")
+PROFILE_SNAPSHOT_MAX_AGE_H = float(os.getenv("PROFILE_SNAPSHOT_MAX_AGE_H", "24"))
 
+# A page counts as settled after this long without DOM mutations or requests in flight
+SETTLE_QUIET_MS = 300
 
-BASE_URL = "https://m.twitch.tv/"
-SEARCH_TERM = "StarCraft II"
-DEVICE_NAME = "iPhone 12 Pro"
-IMPLICIT_WAIT = 0
-PAGELOAD_TIMEOUT = 45
-SCREENSHOT_PATH = "output/final_view.png"
+# Learned locator ordering: stats persist across runs; higher decay adapts faster to markup changes
+LOCATOR_STATS_PATH = os.getenv("LOCATOR_STATS_PATH", ".cache/locator_stats.json")
+LOCATOR_STATS_DECAY = 0.3
+
+# Offline stand-in server (core.standin): injected latency, popups and lazy-loaded results
+STANDIN_OPTIONS = {
+    "latency_ms": 0,
+    "popups": True,
+    "popup_delay_ms": 400,
+    "lazy": True,
+    "page_size": 20,
+    "total_results": 200,
+}
+
+# Per-page performance budget for `pytest --perf` (core.perf_capture); None/missing = unchecked
+PERF_BUDGET = {
+    "ttfb_ms": 3000,
+    "load_ms": 15000,
+    "lcp_ms": 6000,
+    "cls": 0.25,
+    "js_heap_used_bytes": 300_000_000,
+    "transfer_bytes": 20_000_000,
+}
+
+# Named network profiles (core.network_profiles), chosen per test with
+# @pytest.mark.network_profile("lean") or for the whole run with --network-profile.
+# "block": URL patterns dropped via CDP; "throttle": latency (ms) and throughput (kbit/s).
+NETWORK_PROFILE = os.getenv("NETWORK_PROFILE", "full")
+NETWORK_PROFILES = {
+    "full": {},
+    "lean": {
+        "block": [
+            # ads / analytics / telemetry
+            "*doubleclick.net*", "*googlesyndication.com*", "*google-analytics.com*", "*googletagmanager.com*",
+            "*amazon-adsystem.com*", "*scorecardresearch.com*", "*imasdk.googleapis.com*",
+            "*spade.twitch.tv*", "*countess.twitch.tv*", "*client-event-reporter.twitch.tv*",
+            # fonts and images (thumbnails, avatars, emotes); video segments are left alone.
+            # Trailing * so CDN URLs with a query string (".../x.png?w=320") match too.
+            "*.woff*", "*.ttf*", "*.otf*",
+            "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*",
+        ],
+    },
+    "4g": {"throttle": {"latency_ms": 60, "down_kbps": 9_000, "up_kbps": 9_000}},
+    "3g": {"throttle": {"latency_ms": 300, "down_kbps": 1_600, "up_kbps": 750}},
+}
+
+# Screenshot pipeline (core.artifacts): Chrome encodes, a thread pool writes to disk.
+# Failure shots use ARTIFACT_IMAGE_FORMAT; the HTML report only embeds small thumbnails.
+ARTIFACT_WORKERS = 2
+ARTIFACT_IMAGE_FORMAT = "webp"
+ARTIFACT_IMAGE_QUALITY = 80
+REPORT_THUMB_SCALE = 0.3
+REPORT_THUMB_QUALITY = 50
+
+# Failure triage bundles (core.triage): ring sizes per test (network = raw CDP events, ~4 per
+# request) and how often (in WebDriver commands) ChromeDriver's console/network logs are drained
+# into them. TRIAGE_BUNDLES=0 turns capture off, including ChromeDriver's performance logging.
+TRIAGE_BUNDLES = os.getenv("TRIAGE_BUNDLES", "1") != "0"
+TRIAGE_MAX_CONSOLE = 200
+TRIAGE_MAX_EVENTS = 1200
+TRIAGE_MAX_COMMANDS = 300
+TRIAGE_DRAIN_EVERY = 50
+
+# Device metrics for switching emulation over CDP without relaunching Chrome (core.matrix)
+DEVICE_PROFILES = {
+    "iPhone 12 Pro": {"width": 390, "height": 844, "dpr": 3, "mobile": True,
+                      "ua": "Mozilla/5.0 (iPhone; CPU iPhone OS 14_7_1 like Mac OS X) AppleWebKit/605.1.15 "
+                            "(KHTML, like Gecko) Version/14.1.2 Mobile/15E148 Safari/604.1"},
+    "iPhone SE": {"width": 375, "height": 667, "dpr": 2, "mobile": True,
+                  "ua": "Mozilla/5.0 (iPhone; CPU iPhone OS 13_2_3 like Mac OS X) AppleWebKit/605.1.15 "
+                        "(KHTML, like Gecko) Version/13.0.3 Mobile/15E148 Safari/604.1"},
+    "Pixel 5": {"width": 393, "height": 851, "dpr": 2.75, "mobile": True,
+                "ua": "Mozilla/5.0 (Linux; Android 11; Pixel 5) AppleWebKit/537.36 "
+                      "(KHTML, like Gecko) Chrome/90.0.4430.91 Mobile Safari/537.36"},
+    "Samsung Galaxy S8+": {"width": 360, "height": 740, "dpr": 4, "mobile": True,
+                           "ua": "Mozilla/5.0 (Linux; Android 8.0.0; SM-G955U Build/R16NW) AppleWebKit/537.36 "
+                                 "(KHTML, like Gecko) Chrome/87.0.4280.141 Mobile Safari/537.36"},
+    "iPad Mini": {"width": 768, "height": 1024, "dpr": 2, "mobile": True,
+                  "ua": "Mozilla/5.0 (iPad; CPU OS 13_3 like Mac OS X) AppleWebKit/605.1.15 "
+                        "(KHTML, like Gecko) CriOS/87.0.4280.77 Mobile/15E148 Safari/604.1"},
+}
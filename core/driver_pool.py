@@ -0,0 +1,160 @@
+import logging
+import time
+from urllib.parse import urlsplit
+
+from core.driver_setup import create_mobile_driver
+from core.popups import uninstall_popup_dismisser
+
+log = logging.getLogger(__name__)
+
+# Storage.clearDataForOrigin types wiped in keep_cookies mode: everything except
+# cookies, service workers and Cache Storage, which a warm profile is primed with
+_WARM_STORAGE_TYPES = "local_storage,indexeddb,websql,file_systems,shader_cache"
+
+
+class DriverPool:
+    """
+    Keeps warm Chrome instances alive across tests.
+    A driver is reset between uses (tabs, cookies, storage, about:blank)
+    and recycled after `max_uses` checkouts or when it stops responding.
+    `keep_cookies` skips the cookie wipe and keeps service workers and Cache Storage
+    (warm profiles keep their primed consent and caches).
+    """
+
+    def __init__(self, device_name: str, max_uses: int = 20, factory=create_mobile_driver,
+                 keep_cookies: bool = False):
+        self.device_name = device_name
+        self.max_uses = max_uses
+        self.factory = factory
+        self.keep_cookies = keep_cookies
+        self._idle = []      # drivers ready for checkout
+        self._uses = {}      # id(driver) -> number of checkouts so far
+        self.stats = {"hits": 0, "misses": 0, "recycled": 0, "crashed": 0,
+                      "resets": 0, "reset_time": 0.0}
+
+    # ---------------- helpers ----------------
+    @staticmethod
+    def _alive(drv):
+        try:
+            drv.current_url  # cheap round trip; raises if the session is gone
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, drv):
+        self._uses.pop(id(drv), None)
+        try:
+            drv.quit()
+        except Exception:
+            pass
+        # Factories can attach cleanup for per-launch resources (e.g. a cloned profile dir)
+        on_quit = getattr(drv, "_on_quit", None)
+        if on_quit:
+            on_quit()
+
+    @staticmethod
+    def _visited_origins(drv):
+        """http(s) origins in the current tab's navigation history."""
+        try:
+            entries = drv.execute_cdp_cmd("Page.getNavigationHistory", {})["entries"]
+        except Exception:
+            entries = [{"url": drv.current_url}]
+        origins = set()
+        for entry in entries:
+            parts = urlsplit(entry.get("url", ""))
+            if parts.scheme in ("http", "https") and parts.netloc:
+                origins.add(f"{parts.scheme}://{parts.netloc}")
+        return origins
+
+    def _clear_browser_state(self, drv, origins):
+        """Cookies for every domain and storage for every visited origin, over CDP."""
+        if not self.keep_cookies:
+            # delete_all_cookies() would only drop the current page's cookies
+            drv.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        storage_types = _WARM_STORAGE_TYPES if self.keep_cookies else "all"
+        for origin in sorted(origins):
+            drv.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": storage_types})
+
+    def _reset(self, drv):
+        """Bring a used driver back to a blank state. Returns False if it could not be reset."""
+        start = time.perf_counter()
+        try:
+            handles = drv.window_handles
+            # Close every extra tab, keep the first one; note where each of them has been
+            origins = set()
+            for h in handles[1:]:
+                drv.switch_to.window(h)
+                origins |= self._visited_origins(drv)
+                drv.close()
+            drv.switch_to.window(handles[0])
+            origins |= self._visited_origins(drv)
+
+            # sessionStorage is per tab and not covered by Storage.clearDataForOrigin
+            drv.execute_script("try { sessionStorage.clear(); } catch (e) {}")
+            self._clear_browser_state(drv, origins)
+            uninstall_popup_dismisser(drv)  # per-test page scripts must not leak into the next test
+            drv.get("about:blank")
+            return True
+        except Exception as e:
+            log.warning("Driver reset failed, recycling: %s", e)
+            return False
+        finally:
+            self.stats["resets"] += 1
+            self.stats["reset_time"] += time.perf_counter() - start
+
+    # ---------------- public API ----------------
+    def acquire(self):
+        while self._idle:
+            drv = self._idle.pop()
+            if self._alive(drv):
+                self.stats["hits"] += 1
+                self._uses[id(drv)] += 1
+                return drv
+            self.stats["crashed"] += 1
+            self._discard(drv)
+
+        self.stats["misses"] += 1
+        drv = self.factory(self.device_name)
+        self._uses[id(drv)] = 1
+        return drv
+
+    def release(self, drv, broken: bool = False):
+        if broken or not self._alive(drv):
+            self.stats["crashed"] += 1
+            self._discard(drv)
+            return
+        if self._uses.get(id(drv), 0) >= self.max_uses:
+            self.stats["recycled"] += 1
+            self._discard(drv)
+            return
+        if not self._reset(drv):
+            self.stats["crashed"] += 1
+            self._discard(drv)
+            return
+        self._idle.append(drv)
+
+    def close(self):
+        while self._idle:
+            self._discard(self._idle.pop())
+
+    def summary(self) -> str:
+        return stats_summary(self.stats)
+
+
+def merge_stats(all_stats):
+    """Sum several pools' `stats` (e.g. one per xdist worker)."""
+    merged = {}
+    for stats in all_stats:
+        for key, value in stats.items():
+            merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def stats_summary(s) -> str:
+    total = s["hits"] + s["misses"]
+    avg_reset = (s["reset_time"] / s["resets"]) if s["resets"] else 0.0
+    return (
+        f"[POOL] checkouts={total} hits={s['hits']} misses={s['misses']} "
+        f"recycled={s['recycled']} crashed={s['crashed']} "
+        f"reset_total={s['reset_time']:.2f}s avg_reset={avg_reset:.3f}s"
+    )
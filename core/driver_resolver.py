@@ -0,0 +1,106 @@
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from core import config
+
+log = logging.getLogger(__name__)
+
+_EXE = "chromedriver.exe" if sys.platform.startswith("win") else "chromedriver"
+
+# Where Chrome usually lives; the first one that answers --version wins
+_CHROME_BINARIES = (
+    "google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+)
+_WIN_REG_KEYS = (
+    r"HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon",
+    r"HKEY_LOCAL_MACHINE\Software\Google\Chrome\BLBeacon",
+)
+
+_resolved = None  # per-process memo so repeated driver launches skip even the version probe
+
+
+def _run(cmd):
+    try:
+        return subprocess.run(cmd, capture_output=True, text=True, timeout=5).stdout
+    except Exception:
+        return ""
+
+
+def chrome_version():
+    """Return the installed Chrome version string (e.g. '128.0.6613.84') or None."""
+    if sys.platform.startswith("win"):
+        for key in _WIN_REG_KEYS:
+            m = re.search(r"version\s+REG_SZ\s+([\d.]+)", _run(["reg", "query", key, "/v", "version"]))
+            if m:
+                return m.group(1)
+        return None
+    for binary in _CHROME_BINARIES:
+        m = re.search(r"(\d+\.\d+\.\d+\.\d+)", _run([binary, "--version"]))
+        if m:
+            return m.group(1)
+    return None
+
+
+def _cache_path(version):
+    # chromedriver compatibility follows the Chrome major version
+    return Path(config.CHROMEDRIVER_CACHE_DIR).expanduser() / version.split(".")[0] / _EXE
+
+
+def _install_with_webdriver_manager(target: Path = None):
+    """Network path: let webdriver-manager download, then copy the binary into our cache (if any)."""
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        downloaded = ChromeDriverManager().install()
+    except Exception as e:
+        log.warning("webdriver-manager could not provide chromedriver: %s", e)
+        return None
+    if target is None:
+        return Path(downloaded)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(".tmp")
+    shutil.copy2(downloaded, tmp)
+    os.replace(tmp, target)  # atomic, so parallel workers never see a half-written file
+    return target
+
+
+def resolve_chromedriver():
+    """
+    Find a chromedriver path without touching the network when possible.
+    Order: $CHROMEDRIVER → local cache (keyed by Chrome version) → webdriver-manager
+    (result stored in the cache) → None, meaning "let Selenium Manager decide".
+    When the Chrome version cannot be detected the cache is neither read nor written.
+    """
+    global _resolved
+    if _resolved:
+        return _resolved
+
+    explicit = os.getenv("CHROMEDRIVER")
+    if explicit and Path(explicit).is_file():
+        _resolved = explicit
+        return _resolved
+
+    version = chrome_version()
+    if version is None:
+        # Without the Chrome major the cache cannot tell a matching driver from a stale one
+        log.warning("Chrome version not detected; skipping the chromedriver cache")
+        cached = None
+    else:
+        cached = _cache_path(version)
+        if cached.is_file():
+            _resolved = str(cached)
+            return _resolved
+
+    installed = _install_with_webdriver_manager(cached)
+    if installed:
+        log.info("chromedriver %s at %s", "cached" if cached else "provided by webdriver-manager", installed)
+        _resolved = str(installed)
+        return _resolved
+
+    log.info("No cached chromedriver; falling back to Selenium Manager")
+    return None
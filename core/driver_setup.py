@@ -1,14 +1,19 @@
 import os
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from core.driver_resolver import resolve_chromedriver
+from core.instrumentation import CommandRecorder
+from core.settle import install_settle_tracker
 
 
-def create_mobile_driver(device_name: str):
-    # Configure Chrome to emulate a mobile device
-    mobile_emulation = {"deviceName": device_name}
+def create_mobile_driver(device_name: str = None, instrument: bool = False, user_data_dir: str = None,
+                         capture_logs: bool = False):
     options = webdriver.ChromeOptions()
-    options.add_experimental_option("mobileEmulation", mobile_emulation)
+    # Configure Chrome to emulate a mobile device. Without a device name the caller drives
+    # emulation over CDP (core.matrix): ChromeDriver re-applies its own mobileEmulation metrics
+    # on main-frame navigations, which would undo a CDP Emulation.setDeviceMetricsOverride.
+    if device_name:
+        options.add_experimental_option("mobileEmulation", {"deviceName": device_name})
 
     # Common stability and CI-friendly flags
     options.add_argument("--disable-notifications")
@@ -16,16 +21,32 @@ def create_mobile_driver(device_name: str):
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("--lang=en-US")
 
+    # Launch from a prepared profile (see core.profile_snapshot); default is a throwaway one
+    if user_data_dir:
+        options.add_argument(f"--user-data-dir={user_data_dir}")
+        options.add_argument("--no-first-run")
+
+    # Console + network events buffered by ChromeDriver, read via get_log() (see core.triage)
+    if capture_logs:
+        options.set_capability("goog:loggingPrefs", {"browser": "ALL", "performance": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
     # Run headless ONLY when running in GitHub Actions (CI)
     if os.getenv("CI"):
         options.add_argument("--headless=new")
         options.add_argument("--disable-gpu")
         print("⚙️ Running in CI mode: Chrome is headless")
 
-    # Initialize Chrome with WebDriver Manager (auto installs driver)
+    # Cached chromedriver when available; Service(None) hands resolution to Selenium Manager
     driver = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
+        service=Service(resolve_chromedriver()),
         options=options
     )
     driver.set_page_load_timeout(45)
+    # Track mutations/requests from the first byte of every page (used by wait_for_settle)
+    install_settle_tracker(driver)
+
+    # Opt-in per-command timing (driver.recorder); also enabled by WEBDRIVER_INSTRUMENT=1
+    if instrument or os.getenv("WEBDRIVER_INSTRUMENT"):
+        driver.recorder = CommandRecorder(driver).attach()
     return driver
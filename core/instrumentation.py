@@ -0,0 +1,139 @@
+"""
+Opt-in WebDriver command instrumentation.
+
+Every Selenium command goes through `driver.execute`, so wrapping that one method
+sees all round trips: name, duration, payload size and the Screen method that issued it.
+
+    rec = CommandRecorder(driver).attach()
+    ...
+    rec.detach()
+    print(rec.summary_text())
+    rec.write_chrome_trace("output/traces/test.json")   # open in chrome://tracing or Perfetto
+"""
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+
+def _caller():
+    """Nearest 'ScreenClass.method' on the stack, else the nearest non-Selenium function."""
+    frame = sys._getframe(2)
+    fallback = None
+    while frame:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("screens."):
+            owner = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+            if owner is not None:
+                return f"{type(owner).__name__}.{name}"
+            fallback = fallback or f"{module}.{name}"
+        elif fallback is None and not module.startswith(("selenium", "core.instrumentation")):
+            fallback = f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return fallback or "?"
+
+
+def _payload_size(params):
+    if not params:
+        return 0
+    try:
+        return len(json.dumps(params, default=str))
+    except Exception:
+        return 0
+
+
+class CommandRecorder:
+    def __init__(self, driver):
+        self.driver = driver
+        self.commands = []     # dicts: name, caller, start_ms, duration_ms, payload_bytes, error
+        self.listeners = []    # callables(record) notified after every command
+        self._orig = None
+        self._t0 = time.perf_counter()
+
+    def attach(self):
+        if self._orig is not None:
+            return self
+        self._orig = self.driver.execute
+        orig = self._orig
+
+        def execute(driver_command, params=None):
+            start = time.perf_counter()
+            error = None
+            try:
+                return orig(driver_command, params)
+            except Exception as e:
+                error = type(e).__name__
+                raise
+            finally:
+                rec = {
+                    "name": driver_command,
+                    "caller": _caller(),
+                    "start_ms": round((start - self._t0) * 1000, 3),
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                    "payload_bytes": _payload_size(params),
+                    "error": error,
+                }
+                self.commands.append(rec)
+                for listener in self.listeners:
+                    listener(rec)
+
+        self.driver.execute = execute
+        return self
+
+    def detach(self):
+        if self._orig is not None:
+            self.driver.execute = self._orig
+            self._orig = None
+
+    def reset(self):
+        self.commands = []
+        self._t0 = time.perf_counter()
+
+    # ---------------- reporting ----------------
+    def summary(self):
+        by_name = defaultdict(lambda: {"count": 0, "total_ms": 0.0, "payload_bytes": 0})
+        by_caller = defaultdict(lambda: {"count": 0, "total_ms": 0.0})
+        for c in self.commands:
+            n = by_name[c["name"]]
+            n["count"] += 1
+            n["total_ms"] += c["duration_ms"]
+            n["payload_bytes"] += c["payload_bytes"]
+            k = by_caller[c["caller"]]
+            k["count"] += 1
+            k["total_ms"] += c["duration_ms"]
+        return {
+            "commands": len(self.commands),
+            "total_ms": round(sum(c["duration_ms"] for c in self.commands), 1),
+            "by_name": dict(sorted(by_name.items(), key=lambda kv: -kv[1]["total_ms"])),
+            "by_caller": dict(sorted(by_caller.items(), key=lambda kv: -kv[1]["total_ms"])),
+        }
+
+    def summary_text(self, top=8):
+        s = self.summary()
+        lines = [f"[WEBDRIVER] {s['commands']} commands, {s['total_ms']:.0f} ms in round trips"]
+        for caller, v in list(s["by_caller"].items())[:top]:
+            lines.append(f"    {caller:<45} {v['count']:>4} cmds {v['total_ms']:>8.0f} ms")
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        """Trace Event Format: one complete ('X') event per command, grouped by caller."""
+        callers = {}
+        events = []
+        for c in self.commands:
+            tid = callers.setdefault(c["caller"], len(callers) + 1)
+            events.append({
+                "name": c["name"], "cat": "webdriver", "ph": "X", "pid": 1, "tid": tid,
+                "ts": int(c["start_ms"] * 1000), "dur": max(1, int(c["duration_ms"] * 1000)),
+                "args": {"caller": c["caller"], "payload_bytes": c["payload_bytes"], "error": c["error"]},
+            })
+        for caller, tid in callers.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": caller}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
+        return path
@@ -0,0 +1,62 @@
+"""
+Small JSON-backed stores for statistics that persist across runs
+(core.locator_stats, core.steps).
+
+A missing or corrupt file starts an empty store instead of breaking the run.
+Subclasses change `data` only through `update(fn)`. `save()` then re-reads the file
+under a lock file and replays this process's updates on top of it, so parallel xdist
+workers add to each other's numbers instead of the last writer winning.
+"""
+import atexit
+import json
+import os
+from pathlib import Path
+
+from core.paths import exclusive
+
+
+def _load(path):
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}  # corrupt file: start over rather than break the run
+
+
+class JsonStore:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.data = _load(self.path)
+        self._updates = []  # applied to `data` already; replayed onto the file on save
+
+    def update(self, fn):
+        """Apply `fn(data)`, which mutates the dict in place, now and again at save time."""
+        fn(self.data)
+        self._updates.append(fn)
+
+    def save(self):
+        if not self._updates:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with exclusive(self.path.with_name(self.path.name + ".lock"), timeout=30, poll=0.05):
+            data = _load(self.path)  # what other workers saved since we loaded
+            for fn in self._updates:
+                fn(data)
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+            os.replace(tmp, self.path)
+        self.data = data
+        self._updates = []
+
+
+_shared = {}
+
+
+def shared_store(cls, path):
+    """Process-wide `cls(path)` instance, saved automatically at interpreter exit."""
+    key = (cls, str(path))
+    if key not in _shared:
+        store = _shared[key] = cls(path)
+        atexit.register(store.save)
+    return _shared[key]
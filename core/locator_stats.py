@@ -0,0 +1,92 @@
+"""
+Persistent hit-rate / time-to-match statistics for fallback locators.
+
+Each call site (e.g. "search.input") owns an ordered tuple of locators. Every
+`wait_first(..., key=...)` call records which of them matched. Scores are exponentially
+decayed averages, so a selector that a Twitch markup change broke shows up as dead
+within a few runs.
+
+The stats are a report only; they never reorder the chain. wait_first polls every
+locator in the same tick, so order only decides which element wins when several
+match, and the declared order (specific selectors before broad fallbacks) is the
+right tie-breaker. For the same reason `avg_ms` is the whole chain's time to match.
+
+Report dead selectors with:
+    python -m core.locator_stats
+"""
+import sys
+import time
+
+from core import config
+from core.json_store import JsonStore, shared_store
+
+# Prior for a locator we have never seen: neutral hit rate
+_PRIOR_HIT_RATE = 0.5
+
+
+def _loc_id(locator):
+    by, sel = locator
+    return f"{by}|{sel}"
+
+
+class LocatorStats(JsonStore):
+    def __init__(self, path, alpha=None):
+        super().__init__(path)
+        self.alpha = config.LOCATOR_STATS_DECAY if alpha is None else alpha
+
+    def record(self, key, locators, matched, elapsed_ms):
+        """`matched` holds indices into `locators` that found an element; `elapsed_ms` is the chain's."""
+        a, now = self.alpha, int(time.time())
+        ids = [_loc_id(loc) for loc in locators]
+
+        def apply(data):
+            for i, loc_id in enumerate(ids):
+                e = data.setdefault(key, {}).setdefault(loc_id, {
+                    "hit_rate": _PRIOR_HIT_RATE, "avg_ms": None, "tries": 0, "hits": 0, "last_hit": None,
+                })
+                hit = 1.0 if i in matched else 0.0
+                e["tries"] += 1
+                e["hit_rate"] = round(a * hit + (1 - a) * e["hit_rate"], 4)
+                if hit:
+                    e["hits"] += 1
+                    e["last_hit"] = now
+                    e["avg_ms"] = elapsed_ms if e["avg_ms"] is None else round(a * elapsed_ms + (1 - a) * e["avg_ms"], 1)
+
+        self.update(apply)
+
+    def dead(self, min_tries=5, max_hit_rate=0.1):
+        """(key, locator_id, entry) for selectors that have effectively stopped matching."""
+        return [
+            (key, loc, e)
+            for key, locs in sorted(self.data.items())
+            for loc, e in sorted(locs.items())
+            if e["tries"] >= min_tries and e["hit_rate"] <= max_hit_rate
+        ]
+
+
+def get_locator_stats():
+    """Process-wide store, saved automatically at interpreter exit."""
+    return shared_store(LocatorStats, config.LOCATOR_STATS_PATH)
+
+
+def main():
+    stats = LocatorStats(config.LOCATOR_STATS_PATH)
+    if not stats.data:
+        print(f"No locator stats at {stats.path}")
+        return 0
+
+    print(f"{'key':<20} {'hit_rate':>8} {'avg_ms':>8} {'hits/tries':>11}  locator")
+    for key, locs in sorted(stats.data.items()):
+        for loc, e in sorted(locs.items(), key=lambda kv: -kv[1]["hit_rate"]):
+            avg = "-" if e["avg_ms"] is None else f"{e['avg_ms']:.0f}"
+            print(f"{key:<20} {e['hit_rate']:>8.2f} {avg:>8} {e['hits']:>5}/{e['tries']:<5}  {loc}")
+
+    dead = stats.dead()
+    print(f"\nDead selectors ({len(dead)}):")
+    for key, loc, e in dead:
+        print(f"  {key}: {loc} (hit_rate={e['hit_rate']:.2f} over {e['tries']} tries)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,23 @@
 import logging
 from logging import handlers
-from pathlib import Path
+
+from core.paths import output_dir, worker_id
+
 
 def setup_logging():
-    Path("output").mkdir(parents=True, exist_ok=True)
+    # Each xdist worker logs into its own folder; the controller merges them at the end
+    log_file = output_dir() / "test.log"
+    fmt = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+    if worker_id():
+        fmt = f"%(asctime)s [{worker_id()}] [%(levelname)s] %(name)s: %(message)s"
 
     logging.basicConfig(
         level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        format=fmt,
         handlers=[
             logging.StreamHandler(),
             handlers.RotatingFileHandler(
-                "output/test.log", maxBytes=1_000_000, backupCount=2, encoding="utf-8"
+                log_file, maxBytes=1_000_000, backupCount=2, encoding="utf-8"
             ),
         ],
     )
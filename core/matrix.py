@@ -0,0 +1,199 @@
+"""
+Data-driven search matrix: every (term, device) combination through the search flow.
+
+Combinations come from a YAML file (`terms:` x `devices:`) or a CSV with
+`term,device` columns. They are split across worker processes; each worker keeps a
+single Chrome and switches device emulation over CDP instead of relaunching. Workers launch
+Chrome without ChromeDriver's mobileEmulation (it would re-apply its own device on every
+navigation), and each row records the viewport, DPR and UA the page actually saw.
+
+    python -m core.matrix --file matrix.yaml --workers 4 --standin
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+from core import config
+
+_RESULT_FIELDS = ("term", "device", "status", "duration_s", "final_url", "playing",
+                  "inner_width", "dpr", "user_agent", "error")
+
+# What the page itself sees, to prove which emulation actually ran
+_EMULATION_JS = "return [window.innerWidth, window.devicePixelRatio, navigator.userAgent];"
+
+
+def load_matrix(path):
+    """Return [(term, device), ...] from a YAML or CSV matrix file."""
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="", encoding="utf-8") as f:
+            combos = [(row["term"].strip(), row["device"].strip()) for row in csv.DictReader(f)]
+    else:
+        import yaml  # optional dependency, only needed for YAML matrices
+        data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+        combos = [(t, d) for d in data.get("devices", [config.DEVICE_NAME]) for t in data.get("terms", [])]
+
+    if not combos:
+        raise ValueError(f"{path} has no term × device combinations (needs at least one term and one device)")
+    unknown = sorted({d for _, d in combos} - set(config.DEVICE_PROFILES))
+    if unknown:
+        raise ValueError(f"Devices missing from config.DEVICE_PROFILES: {unknown}")
+    return combos
+
+
+def emulation_mismatch(row):
+    """True when the page's viewport/DPR/UA differ from the device profile the row ran as."""
+    p = config.DEVICE_PROFILES.get(row["device"])
+    if not p or row.get("inner_width") is None:
+        return False
+    return (row["inner_width"], row["dpr"], row["user_agent"]) != (p["width"], p["dpr"], p["ua"])
+
+
+def apply_device(driver, device):
+    """Switch emulation in place (viewport, DPR, touch, UA) for an already running Chrome."""
+    p = config.DEVICE_PROFILES[device]
+    driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", {
+        "width": p["width"], "height": p["height"], "deviceScaleFactor": p["dpr"], "mobile": p["mobile"],
+    })
+    driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": p["mobile"], "maxTouchPoints": 5})
+    driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": p["ua"]})
+
+
+def _run_one(driver, base_url, term, device):
+    # Imported here so the parent process never needs Selenium just to plan the matrix
+    from screens.home_screen import HomeScreen
+    from screens.search_screen import SearchScreen
+    from screens.streamer_screen import StreamerScreen
+
+    start = time.perf_counter()
+    row = {"term": term, "device": device, "status": "passed", "final_url": None, "playing": None,
+           "inner_width": None, "dpr": None, "user_agent": None, "error": None}
+    try:
+        home = HomeScreen(driver)
+        home.open(base_url)
+        row["inner_width"], row["dpr"], row["user_agent"] = driver.execute_script(_EMULATION_JS)
+        home.tap_search_icon()
+        search = SearchScreen(driver)
+        search.enter_query(term)
+        search.scroll_down_twice()
+        search.open_first_result()
+        row["final_url"] = driver.current_url
+        assert "/search" not in row["final_url"], f"Still on search page: {row['final_url']}"
+        stream = StreamerScreen(driver)
+        stream.dismiss_popups_if_any()
+        stream.wait_until_loaded()
+        row["playing"] = stream.try_start_playback().get("playing")
+    except Exception as e:
+        row["status"] = "failed"
+        row["error"] = f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"[:200]
+    row["duration_s"] = round(time.perf_counter() - start, 2)
+    return row
+
+
+def _worker(args):
+    """One process, one Chrome; `combos` is sorted by device so emulation switches rarely."""
+    base_url, combos = args
+    from core.driver_pool import DriverPool
+
+    # No launch-time device: emulation is owned by apply_device() over CDP
+    pool = DriverPool(None, max_uses=len(combos) + 1)
+    rows, last = [], (None, None)  # (driver, device) currently emulated
+    try:
+        for term, device in combos:
+            driver = pool.acquire()
+            try:
+                # A recycled/relaunched browser starts from launch defaults, so re-apply then too
+                if last != (driver, device):
+                    apply_device(driver, device)
+                    last = (driver, device)
+                rows.append(_run_one(driver, base_url, term, device))
+            finally:
+                pool.release(driver)
+    finally:
+        pool.close()
+    return rows
+
+
+def _chunks(combos, n):
+    """Split into n contiguous chunks (keeps each worker on as few devices as possible)."""
+    combos = sorted(combos, key=lambda c: (c[1], c[0]))
+    if not combos:
+        return []
+    size = -(-len(combos) // n)
+    return [combos[i:i + size] for i in range(0, len(combos), size)]
+
+
+def run_matrix(combos, workers=1, base_url=None):
+    chunks = [(base_url or config.BASE_URL, chunk) for chunk in _chunks(combos, max(1, workers))]
+    if len(chunks) == 1:
+        return _worker(chunks[0])
+    with Pool(len(chunks)) as pool:
+        return [row for rows in pool.map(_worker, chunks) for row in rows]
+
+
+def print_table(rows):
+    devices = sorted({r["device"] for r in rows})
+    terms = sorted({r["term"] for r in rows})
+    cell = {(r["term"], r["device"]): r for r in rows}
+    width = max([len(t) for t in terms] + [10])
+    print("\n" + f"{'term':<{width}} " + " ".join(f"{d[:16]:>16}" for d in devices))
+    for t in terms:
+        line = []
+        for d in devices:
+            r = cell.get((t, d))
+            if not r:
+                line.append(f"{'-':>16}")
+                continue
+            mark = "!" if emulation_mismatch(r) else ""
+            line.append(f"{('PASS' if r['status'] == 'passed' else 'FAIL') + ' ' + str(r['duration_s']) + 's' + mark:>16}")
+        print(f"{t:<{width}} " + " ".join(line))
+    failed = [r for r in rows if r["status"] != "passed"]
+    print(f"\n{len(rows) - len(failed)}/{len(rows)} passed")
+    for r in failed:
+        print(f"  FAIL {r['term']} @ {r['device']}: {r['error']}")
+    for r in rows:
+        if emulation_mismatch(r):
+            print(f"  ! {r['term']} @ {r['device']} ran as {r['inner_width']}px @{r['dpr']}x: {r['user_agent']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the search flow across terms x devices")
+    parser.add_argument("--file", default="matrix.yaml", help="YAML (terms/devices) or CSV (term,device)")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--standin", action="store_true", help="Use the local stand-in site")
+    parser.add_argument("--out", default=str(Path(config.OUTPUT_DIR) / "matrix_results"))
+    args = parser.parse_args()
+
+    try:
+        combos = load_matrix(args.file)
+    except ValueError as e:
+        parser.error(str(e))
+    server = None
+    if args.standin:
+        from core.standin import StandinServer
+        server = StandinServer().start()
+
+    try:
+        rows = run_matrix(combos, args.workers, server.url if server else None)
+    finally:
+        if server:
+            server.stop()
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.with_suffix(".json").write_text(json.dumps(rows, indent=2), encoding="utf-8")
+    with out.with_suffix(".csv").open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=_RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    print_table(rows)
+    print(f"\nResults written to {out.with_suffix('.json')} and {out.with_suffix('.csv')}")
+    return 0 if all(r["status"] == "passed" for r in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
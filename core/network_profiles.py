@@ -0,0 +1,37 @@
+import logging
+
+from core import config
+
+log = logging.getLogger(__name__)
+
+# No throttling: -1 throughput disables the limit in Network.emulateNetworkConditions
+_UNTHROTTLED = {"offline": False, "latency": 0, "downloadThroughput": -1, "uploadThroughput": -1}
+
+
+def apply_network_profile(driver, name):
+    """
+    Apply a profile from config.NETWORK_PROFILES via CDP (URL blocking and/or throttling).
+    Every call fully replaces the previous profile, so "full" also acts as a reset.
+    """
+    if name not in config.NETWORK_PROFILES:
+        raise ValueError(f"Unknown network profile {name!r}; choose from {sorted(config.NETWORK_PROFILES)}")
+    profile = config.NETWORK_PROFILES[name]
+
+    conditions = dict(_UNTHROTTLED)
+    throttle = profile.get("throttle")
+    if throttle:
+        conditions.update({
+            "latency": throttle["latency_ms"],
+            "downloadThroughput": throttle["down_kbps"] * 1000 // 8,  # CDP wants bytes/s
+            "uploadThroughput": throttle["up_kbps"] * 1000 // 8,
+        })
+
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": profile.get("block", [])})
+        driver.execute_cdp_cmd("Network.emulateNetworkConditions", conditions)
+    except Exception as e:
+        log.warning("Network profile %r not applied: %s", name, e)
+        return False
+    log.info("[NETWORK] profile=%s blocked=%d throttle=%s", name, len(profile.get("block", [])), throttle)
+    return True
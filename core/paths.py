@@ -0,0 +1,62 @@
+import contextlib
+import os
+import time
+from pathlib import Path
+
+from core import config
+
+
+def worker_id() -> str:
+    """xdist worker name ('gw0', 'gw1', ...) or '' when running in a single process."""
+    return os.getenv("PYTEST_XDIST_WORKER", "")
+
+
+def output_dir(*parts) -> Path:
+    """
+    Artifact folder for this process: output/ when serial, output/<worker>/ under xdist,
+    so parallel workers never write to the same file.
+    """
+    base = Path(config.OUTPUT_DIR)
+    wid = worker_id()
+    path = base.joinpath(wid, *parts) if wid else base.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def worker_dirs():
+    """Per-worker folders left by a parallel run (controller side)."""
+    base = Path(config.OUTPUT_DIR)
+    return sorted(p for p in base.glob("gw*") if p.is_dir()) if base.exists() else []
+
+
+def screenshot_path() -> Path:
+    return output_dir() / Path(config.SCREENSHOT_PATH).name
+
+
+@contextlib.contextmanager
+def exclusive(lock_path, timeout=300, poll=0.5):
+    """Cross-process lock file, e.g. so parallel workers do not build or write the same file at once."""
+    lock_path = Path(lock_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.time() + timeout
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            # A crashed holder leaves its lock behind; treat very old locks as stale
+            try:
+                if time.time() - lock_path.stat().st_mtime > timeout:
+                    lock_path.unlink()
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.time() > deadline:
+                raise TimeoutError(f"Timed out waiting for {lock_path}")
+            time.sleep(poll)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        with contextlib.suppress(FileNotFoundError):
+            lock_path.unlink()
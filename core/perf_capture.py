@@ -0,0 +1,193 @@
+"""
+Page performance capture over the Chrome DevTools Protocol.
+
+`PerfCapture.snapshot(label)` records, for the page currently shown:
+- document-level metrics (navigation timing, LCP, CLS) under "document". They belong to
+  the document, not the route: after a client-side (SPA) route change they repeat the
+  previous snapshot's values, so such snapshots are marked `soft_navigation` and the
+  document-level budget is not checked again for them;
+- requests and transfer bytes *since the previous snapshot*, from CDP Network events
+  (`Network.loadingFinished.encodedDataLength`, read via core.chrome_logs). Resource
+  Timing reports transferSize 0 for cross-origin assets without Timing-Allow-Origin,
+  i.e. most CDN traffic, so it is only a labelled fallback for drivers without logs;
+- JS heap and DOM nodes from CDP Performance.getMetrics.
+Metrics are written next to the screenshot; pages over config.PERF_BUDGET fail the test.
+"""
+import json
+import logging
+import time
+from pathlib import Path
+
+from core import config
+from core.chrome_logs import chrome_logs
+
+log = logging.getLogger(__name__)
+
+# Collects LCP and CLS from the start of every document (buffered observers)
+_VITALS_JS = r"""
+(function () {
+  if (window.__vitals) return;
+  const v = window.__vitals = { lcp: null, cls: 0 };
+  try {
+    performance.setResourceTimingBufferSize(2000);  // default 250 undercounts busy pages
+    new PerformanceObserver((list) => {
+      const entries = list.getEntries();
+      if (entries.length) v.lcp = entries[entries.length - 1].startTime;
+    }).observe({ type: 'largest-contentful-paint', buffered: true });
+    new PerformanceObserver((list) => {
+      for (const e of list.getEntries()) if (!e.hadRecentInput) v.cls += e.value;
+    }).observe({ type: 'layout-shift', buffered: true });
+  } catch (e) {}
+})();
+"""
+
+_COLLECT_JS = _VITALS_JS + r"""
+const nav = performance.getEntriesByType('navigation')[0] || {};
+const res = performance.getEntriesByType('resource');
+const round = (x) => (x === null || x === undefined) ? null : Math.round(x);
+const out = {
+  url: location.href,
+  document: {
+    url: nav.name || null,
+    time_origin: performance.timeOrigin,
+    ttfb_ms: round(nav.responseStart),
+    dom_content_loaded_ms: round(nav.domContentLoadedEventEnd),
+    load_ms: round(nav.loadEventEnd) || null,
+    lcp_ms: round(window.__vitals.lcp),
+    cls: Math.round(window.__vitals.cls * 1000) / 1000,
+  },
+  // Fallback only: cross-origin entries without Timing-Allow-Origin report transferSize 0
+  rt_requests: res.length,
+  rt_transfer_bytes: res.reduce((n, r) => n + (r.transferSize || 0), 0),
+};
+// Next snapshot only counts resources loaded after this one
+performance.clearResourceTimings();
+return out;
+"""
+
+# Document-level budget keys; not re-checked after a client-side route change
+_DOCUMENT_KEYS = ("ttfb_ms", "dom_content_loaded_ms", "load_ms", "lcp_ms", "cls")
+_REQUEST_EVENT = '"Network.requestWillBeSent"'
+_FINISHED_EVENT = '"Network.loadingFinished"'
+
+
+def cdp_metrics(driver):
+    """JS heap and DOM node counts from CDP Performance.getMetrics ({} if unavailable)."""
+    try:
+        raw = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+    except Exception:
+        return {}
+    m = {item["name"]: item["value"] for item in raw}
+    return {
+        "js_heap_used_bytes": int(m.get("JSHeapUsedSize", 0)) or None,
+        "js_heap_total_bytes": int(m.get("JSHeapTotalSize", 0)) or None,
+        "dom_nodes": int(m.get("Nodes", 0)) or None,
+    }
+
+
+def _budget_violations(metrics, budget):
+    values = dict(metrics)
+    if not metrics.get("soft_navigation"):
+        document = metrics.get("document") or {}
+        values.update({k: document[k] for k in _DOCUMENT_KEYS if k in document})
+    violations = []
+    for key, limit in budget.items():
+        value = values.get(key)
+        if limit is not None and value is not None and not isinstance(value, dict) and value > limit:
+            violations.append(f"{metrics.get('label')}: {key}={value} > {limit}")
+    return violations
+
+
+class PerfCapture:
+    def __init__(self, driver, budget=None, enabled=True):
+        self.driver = driver
+        self.budget = config.PERF_BUDGET if budget is None else budget
+        self.enabled = enabled
+        self.pages = []
+        self._script_id = None
+        self._logs = chrome_logs(driver)
+        self._since_ms = 0
+        self._requests = 0
+        self._bytes = 0
+
+    def start(self):
+        """Enable the CDP Performance domain and inject the vitals observers into future documents."""
+        if not self.enabled:
+            return self
+        try:
+            self.driver.execute_cdp_cmd("Performance.enable", {"timeDomain": "timeTicks"})
+            res = self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _VITALS_JS})
+            self._script_id = res.get("identifier")
+        except Exception as e:
+            log.warning("CDP performance capture unavailable: %s", e)
+        self._since_ms = time.time() * 1000
+        self._logs.subscribe("performance", self._on_events)
+        return self
+
+    def _on_events(self, entries):
+        """Count requests and encoded bytes from Network events (JSON-parsed only when needed)."""
+        for e in entries:
+            if e.get("timestamp", 0) < self._since_ms:
+                continue
+            head = e["message"][:96]
+            if _REQUEST_EVENT in head:
+                self._requests += 1
+            elif _FINISHED_EVENT in head:
+                try:
+                    self._bytes += json.loads(e["message"])["message"]["params"].get("encodedDataLength", 0)
+                except Exception:
+                    pass
+
+    def stop(self):
+        """Undo start() so a pooled driver goes back clean."""
+        if not self.enabled:
+            return
+        self._logs.unsubscribe("performance", self._on_events)
+        try:
+            self.driver.execute_cdp_cmd("Performance.disable", {})
+            if self._script_id:
+                self.driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": self._script_id})
+        except Exception:
+            pass
+        self._script_id = None
+
+    def snapshot(self, label):
+        """Record metrics for the page currently shown under `label` (e.g. 'home')."""
+        if not self.enabled:
+            return None
+        self._logs.drain()
+        try:
+            page = self.driver.execute_script(_COLLECT_JS)
+        except Exception as e:
+            page = {"error": str(e)}
+        rt_requests, rt_bytes = page.pop("rt_requests", None), page.pop("rt_transfer_bytes", None)
+        if self._logs.available:
+            network = {"requests": self._requests, "transfer_bytes": self._bytes, "network_source": "cdp"}
+        else:
+            network = {"requests": rt_requests, "transfer_bytes": rt_bytes, "network_source": "resource_timing"}
+        self._requests = self._bytes = 0
+
+        document = page.get("document") or {}
+        previous = self.pages[-1].get("document", {}) if self.pages else {}
+        soft = bool(document) and document.get("time_origin") == previous.get("time_origin")
+        metrics = {"label": label, **page, "soft_navigation": soft, **network, **cdp_metrics(self.driver)}
+        self.pages.append(metrics)
+        log.info("[PERF] %s", metrics)
+        return metrics
+
+    def violations(self):
+        out = []
+        for page in self.pages:
+            out.extend(_budget_violations(page, self.budget))
+        return out
+
+    def assert_within_budget(self):
+        problems = self.violations()
+        assert not problems, "Performance budget exceeded:\n  " + "\n  ".join(problems)
+
+    def write(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"budget": self.budget, "pages": self.pages,
+                                    "violations": self.violations()}, indent=2), encoding="utf-8")
+        return path
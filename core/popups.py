@@ -0,0 +1,92 @@
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+# Watches the DOM and clicks any visible element matching the popup locators as soon as it
+# appears. Every click is appended to window.__popupLog so Python can read it without waiting.
+_DISMISSER_JS = r"""
+(function (locs) {
+  if (window.__popupDismisser) return;
+  window.__popupDismisser = true;
+  const log = window.__popupLog = window.__popupLog || [];
+  const clicked = new WeakSet();
+
+  const find = (by, sel) => {
+    if (by === 'xpath') {
+      const snap = document.evaluate(sel, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      const out = [];
+      for (let i = 0; i < snap.snapshotLength; i++) out.push(snap.snapshotItem(i));
+      return out;
+    }
+    return Array.from(document.querySelectorAll(sel));
+  };
+  const visible = (el) => {
+    const r = el.getBoundingClientRect();
+    return r.width > 0 && r.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+  };
+
+  const scan = () => {
+    for (const [by, sel] of locs) {
+      let els = [];
+      try { els = find(by, sel); } catch (e) { continue; }
+      for (const el of els) {
+        if (clicked.has(el) || !visible(el)) continue;
+        clicked.add(el);
+        try { el.click(); } catch (e) { continue; }
+        log.push({ locator: by + '|' + sel, text: (el.innerText || el.getAttribute('aria-label') || '').trim().slice(0, 80),
+                   url: location.href, t_ms: Math.round(performance.now()), at: Date.now() });
+      }
+    }
+  };
+
+  // Coalesce bursts of mutations into one scan
+  let pending = false;
+  const schedule = () => {
+    if (pending) return;
+    pending = true;
+    setTimeout(() => { pending = false; scan(); }, 50);
+  };
+  new MutationObserver(schedule).observe(document, { subtree: true, childList: true, attributes: true });
+  schedule();
+})(%s);
+"""
+
+
+def _script(locators):
+    return _DISMISSER_JS % json.dumps([[by, sel] for by, sel in locators])
+
+
+def install_popup_dismisser(driver, locators):
+    """
+    Start auto-dismissing popups matching `locators` ((By, selector) pairs, CSS or XPath)
+    in the current page and in every page loaded afterwards. Safe to call repeatedly.
+    """
+    source = _script(locators)
+    if not getattr(driver, "_popup_dismisser_id", None):
+        try:
+            res = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+            driver._popup_dismisser_id = res.get("identifier")
+        except Exception as e:
+            log.debug("Popup dismisser not registered for new documents: %s", e)
+    driver.execute_script(source)
+
+
+def uninstall_popup_dismisser(driver):
+    """Stop injecting the dismisser into new documents (used when a pooled driver is reset)."""
+    script_id = getattr(driver, "_popup_dismisser_id", None)
+    if not script_id:
+        return
+    try:
+        driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script_id})
+    except Exception:
+        pass
+    driver._popup_dismisser_id = None
+
+
+def dismissed_popups(driver):
+    """What the in-page dismisser has clicked on the current page so far (returns immediately)."""
+    try:
+        return driver.execute_script("return window.__popupLog || [];")
+    except Exception:
+        return []
@@ -0,0 +1,200 @@
+"""
+Warm-start Chrome profiles.
+
+A "golden" user-data-dir is prepared once (consent accepted, HTTP cache and service
+worker primed) and cloned for every browser launch, so first navigations skip the
+consent dialog and most static downloads. Chrome rewrites cache and database files in
+place, so every clone is private: a copy-on-write clone where the filesystem supports it
+(btrfs/XFS reflinks, APFS clonefile), a plain copy elsewhere (ext4, e.g. GitHub runners).
+A plain copy of a ~110 MB / 2,300-file profile takes 0.2-0.6 s on ext4, paid once per
+browser launch (the pool reuses browsers), not per test. Caches that do not help a warm
+start (shader caches, ML models, crash reports) are pruned from the snapshot to keep it small.
+
+The snapshot is rebuilt when Chrome's version, the BASE_URL host or the device changes,
+or when it is older than config.PROFILE_SNAPSHOT_MAX_AGE_H.
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+from core import config
+from core.driver_resolver import chrome_version
+from core.paths import exclusive
+
+log = logging.getLogger(__name__)
+
+_MANIFEST = "snapshot.json"
+# Chrome refuses to start on a profile that still holds another instance's locks
+_SKIP = {"SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile", "LOCK"}
+# Regenerated by Chrome on demand and irrelevant to page loads: not worth copying per launch
+_PRUNE = ("GrShaderCache", "GraphiteDawnCache", "ShaderCache", "Default/GPUCache", "Default/DawnCache",
+          "optimization_guide_model_store", "OnDeviceHeadSuggestModel", "Safe Browsing",
+          "component_crx_cache", "Crashpad", "BrowserMetrics")
+
+_cow_support = None  # probed once per process: copy-on-write command or False
+
+
+def snapshot_dir():
+    return Path(config.PROFILE_SNAPSHOT_DIR).expanduser()
+
+
+def _expected_manifest(device_name):
+    # Host, not full URL: consent cookies ignore the port, so every stand-in worker can share one snapshot
+    return {"chrome_version": chrome_version(), "site": urlparse(config.BASE_URL).hostname, "device": device_name}
+
+
+def is_stale(device_name=None):
+    """True when there is no usable snapshot for the current Chrome/site/device."""
+    manifest_path = snapshot_dir() / _MANIFEST
+    if not manifest_path.is_file():
+        return True
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except Exception:
+        return True
+    expected = _expected_manifest(device_name or config.DEVICE_NAME)
+    if any(manifest.get(k) != v for k, v in expected.items()):
+        return True
+    return time.time() - manifest.get("created", 0) > config.PROFILE_SNAPSHOT_MAX_AGE_H * 3600
+
+
+def _default_warmup(driver):
+    """Walk home → search → first result so consent, cache and service worker (player
+    assets included) are in the profile. Each page gets the wait that fits it."""
+    from core.settle import wait_for_settle
+    from screens.home_screen import HomeScreen
+    from screens.search_screen import SearchScreen
+    from screens.streamer_screen import StreamerScreen
+
+    home, search, stream = HomeScreen(driver), SearchScreen(driver), StreamerScreen(driver)
+    home.open(config.BASE_URL)
+    stream.dismiss_popups_if_any()  # in-page dismisser accepts consent as soon as it renders
+    wait_for_settle(driver, timeout=5)
+    home.tap_search_icon()
+    search.enter_query(config.SEARCH_TERM)  # waits for the input, then for the results to settle
+    search.open_first_result()
+    stream.dismiss_popups_if_any()
+    stream.wait_until_loaded(timeout=10, settle_timeout=5)
+
+
+def prepare_snapshot(device_name=None, warmup=None, force=False):
+    """Build the golden profile if missing or stale. Returns its path."""
+    from core.driver_setup import create_mobile_driver
+
+    device_name = device_name or config.DEVICE_NAME
+    golden = snapshot_dir()
+    with exclusive(golden.with_name(golden.name + ".lock")):
+        if not force and not is_stale(device_name):
+            return golden
+
+        log.info("Building warm profile snapshot at %s", golden)
+        staging = Path(tempfile.mkdtemp(prefix="golden-", dir=golden.parent))
+        driver = create_mobile_driver(device_name, user_data_dir=str(staging))
+        try:
+            try:
+                (warmup or _default_warmup)(driver)
+            except Exception as e:
+                log.warning("Snapshot warm-up incomplete: %s", e)
+        finally:
+            driver.quit()  # flushes cookies/cache to disk
+
+        for rel in _PRUNE:
+            shutil.rmtree(staging / rel, ignore_errors=True)
+        manifest = {**_expected_manifest(device_name), "created": int(time.time())}
+        (staging / _MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        if golden.exists():
+            shutil.rmtree(golden, ignore_errors=True)
+        os.replace(staging, golden)
+        return golden
+
+
+def _ignore(_dir, names):
+    return [n for n in names if n in _SKIP or n == _MANIFEST]
+
+
+def _cow_command(src_dir, dest_dir):
+    """`cp` arguments for a copy-on-write clone from src_dir to dest_dir, or False if unsupported.
+
+    Probed with one small file: `--reflink=always` on an unsupported filesystem only fails
+    after trying every file, which costs more than a plain copy.
+    """
+    global _cow_support
+    if _cow_support is None:
+        if sys.platform.startswith("linux"):
+            cmd = ["cp", "-a", "--reflink=always"]
+        elif sys.platform == "darwin":
+            cmd = ["cp", "-c", "-pR"]
+        else:
+            cmd = None
+        _cow_support = False
+        if cmd and shutil.which("cp"):
+            probe_dir = Path(tempfile.mkdtemp(prefix="cow-probe-", dir=dest_dir))
+            try:
+                (probe_dir / "a").write_bytes(b"probe")
+                ok = subprocess.run([*cmd, str(probe_dir / "a"), str(probe_dir / "b")],
+                                    capture_output=True).returncode == 0
+                _cow_support = cmd if ok and Path(src_dir).stat().st_dev == probe_dir.stat().st_dev else False
+            finally:
+                shutil.rmtree(probe_dir, ignore_errors=True)
+    return _cow_support
+
+
+def clone_snapshot(dest=None):
+    """Clone the golden profile into `dest` (a new temp dir by default) and return its path."""
+    golden = snapshot_dir()
+    dest = Path(dest) if dest else Path(tempfile.mkdtemp(prefix="tm-profile-", dir=golden.parent))
+    if dest.exists():
+        shutil.rmtree(dest)
+
+    start = time.perf_counter()
+    cmd = _cow_command(golden, dest.parent)
+    if cmd and subprocess.run([*cmd, str(golden), str(dest)], capture_output=True).returncode == 0:
+        for name in _SKIP | {_MANIFEST}:
+            for lock in dest.rglob(name):
+                with contextlib.suppress(OSError):
+                    lock.unlink()
+        how = "copy-on-write"
+    else:
+        shutil.rmtree(dest, ignore_errors=True)
+        shutil.copytree(golden, dest, ignore=_ignore, symlinks=True)
+        how = "copy"
+    log.info("Cloned warm profile (%s) in %.2fs", how, time.perf_counter() - start)
+    return dest
+
+
+def warm_driver_factory(device_name, **kwargs):
+    """DriverPool factory: launch Chrome from a fresh clone; the clone is deleted on quit."""
+    from core.driver_setup import create_mobile_driver
+
+    clone = clone_snapshot()
+    try:
+        driver = create_mobile_driver(device_name, user_data_dir=str(clone), **kwargs)
+    except Exception:
+        shutil.rmtree(clone, ignore_errors=True)
+        raise
+    driver._on_quit = lambda: shutil.rmtree(clone, ignore_errors=True)
+    return driver
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build (or rebuild) the warm-start Chrome profile")
+    parser.add_argument("--device", default=config.DEVICE_NAME)
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the snapshot is fresh")
+    args = parser.parse_args()
+    stale = is_stale(args.device)
+    path = prepare_snapshot(args.device, force=args.force)
+    print(f"[PROFILE] {'built' if stale or args.force else 'up to date'}: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
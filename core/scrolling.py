@@ -0,0 +1,87 @@
+import logging
+
+from core.settle import TRACKER_JS
+
+log = logging.getLogger(__name__)
+
+# Scrolls, waits for `scrollend` (or a short rAF-based stability check where the event is
+# unsupported / no movement happened), then waits until lazy-loaded nodes matching
+# `itemSelector` stop arriving for `quietMs` and the fetch/XHR the scroll triggered have
+# finished (core.settle's tracker). One round trip per gesture.
+_SCROLL_JS = TRACKER_JS + r"""
+const dy = Math.round(arguments[0] * window.innerHeight), smooth = arguments[1], itemSelector = arguments[2];
+const quietMs = arguments[3], timeoutMs = arguments[4], staleMs = arguments[5];
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+const y0 = window.pageYOffset;
+const count = () => itemSelector ? document.querySelectorAll(itemSelector).length : 0;
+const before = count();
+
+// Short page: make room by nudging up first so the gesture still moves
+const maxY = () => document.documentElement.scrollHeight - window.innerHeight;
+let nudged = false;
+if (dy > 0 && y0 >= maxY() - 2 && y0 > 0) {
+  window.scrollTo(0, Math.max(0, y0 - Math.abs(dy)));
+  nudged = true;
+}
+const from = window.pageYOffset;
+
+let lastAdd = performance.now();
+const mo = new MutationObserver((records) => {
+  for (const r of records) if (r.addedNodes.length) { lastAdd = performance.now(); break; }
+});
+mo.observe(document.body, { childList: true, subtree: true });
+
+const finish = (reason) => {
+  mo.disconnect();
+  const y = window.pageYOffset;
+  done({ offset: Math.round(y), start_offset: Math.round(y0), distance: Math.round(y - from),
+         nudged, new_items: count() - before, elapsed_ms: Math.round(performance.now() - start), reason });
+};
+
+// A page of results still in flight would render after a merely quiet DOM
+const inflight = (now) => {
+  for (const began of window.__settle.inflight.values()) if (now - began < staleMs) return true;
+  return false;
+};
+const waitForLoads = () => {
+  const tick = () => {
+    const now = performance.now();
+    if (now - start >= timeoutMs) return finish('timeout');
+    if (now - lastAdd >= quietMs && !inflight(now)) return finish('settled');
+    setTimeout(tick, 50);
+  };
+  lastAdd = Math.max(lastAdd, performance.now());
+  tick();
+};
+
+// scrollend fires once the (smooth) scroll finishes; fall back to watching pageYOffset
+let ended = false;
+const onEnd = () => { if (ended) return; ended = true; window.removeEventListener('scrollend', onEnd); waitForLoads(); };
+window.addEventListener('scrollend', onEnd);
+window.scrollBy({ top: dy, behavior: smooth ? 'smooth' : 'instant' });
+
+let lastY = -1, still = 0;
+const watch = () => {
+  if (ended) return;
+  const y = window.pageYOffset;
+  still = (y === lastY) ? still + 1 : 0;
+  lastY = y;
+  if (still >= 3 || performance.now() - start >= timeoutMs) return onEnd();  // no movement / no event
+  requestAnimationFrame(watch);
+};
+setTimeout(() => requestAnimationFrame(watch), 50);
+"""
+
+
+def scroll_and_wait(driver, viewports, item_selector=None, smooth=True, quiet_ms=300, timeout=5, stale_ms=5000):
+    """
+    Scroll by `viewports` × window height and wait in-page for the scroll to end, for lazy-loaded
+    `item_selector` nodes to finish rendering and for fetch/XHR younger than `stale_ms` to complete.
+    Returns a dict with offset, start_offset, distance, nudged, new_items, elapsed_ms and reason.
+    """
+    driver.set_script_timeout(timeout + 2)
+    result = driver.execute_async_script(_SCROLL_JS, viewports, smooth, item_selector, quiet_ms,
+                                         int(timeout * 1000), stale_ms)
+    log.info("[SCROLL] %s", result)
+    return result
@@ -0,0 +1,88 @@
+import logging
+
+from core import config
+
+log = logging.getLogger(__name__)
+
+# In-page activity tracker: DOM mutations, fetch/XHR in flight. Idempotent, so it can be
+# injected on every new document (CDP) or lazily by the first settle call.
+TRACKER_JS = r"""
+(function () {
+  if (window.__settle) return;
+  const t = window.__settle = { last: performance.now(), mutations: 0, requests: 0, inflight: new Map(), seq: 0 };
+  const touch = () => { t.last = performance.now(); };
+  const begin = () => { const id = ++t.seq; t.requests++; t.inflight.set(id, performance.now()); touch(); return id; };
+  const end = (id) => { t.inflight.delete(id); touch(); };
+
+  new MutationObserver((records) => { t.mutations += records.length; touch(); })
+    .observe(document, { subtree: true, childList: true, attributes: true, characterData: true });
+
+  if (window.fetch) {
+    const origFetch = window.fetch;
+    window.fetch = function () {
+      const id = begin();
+      return origFetch.apply(this, arguments).finally(() => end(id));
+    };
+  }
+  const origSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    const id = begin();
+    this.addEventListener('loadend', () => end(id), { once: true });
+    return origSend.apply(this, arguments);
+  };
+})();
+"""
+
+# Resolves once nothing happened for `quietMs`, then waits for two animation frames so
+# pending renders flush. Requests older than `staleMs` (long-poll, streams) are ignored.
+SETTLE_JS = TRACKER_JS + r"""
+const quietMs = arguments[0], timeoutMs = arguments[1], staleMs = arguments[2];
+const done = arguments[arguments.length - 1];
+const t = window.__settle, start = performance.now();
+const m0 = t.mutations, r0 = t.requests;
+
+const finish = (settled) => {
+  clearInterval(timer);
+  let sent = false;
+  const send = () => {
+    if (sent) return; sent = true;
+    done({ settled, elapsed_ms: Math.round(performance.now() - start),
+           mutations: t.mutations - m0, requests: t.requests - r0 });
+  };
+  requestAnimationFrame(() => requestAnimationFrame(send));
+  setTimeout(send, 100);  // rAF is throttled in hidden/headless tabs
+};
+const busy = (now) => {
+  for (const began of t.inflight.values()) if (now - began < staleMs) return true;
+  return false;
+};
+const timer = setInterval(() => {
+  const now = performance.now();
+  if (now - start >= timeoutMs) return finish(false);
+  if (!busy(now) && now - t.last >= quietMs) finish(true);
+}, 50);
+"""
+
+
+def install_settle_tracker(driver):
+    """Inject the tracker into every future document so requests made during load are counted."""
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": TRACKER_JS})
+    except Exception as e:
+        log.debug("Settle tracker not pre-installed (%s); it will be injected lazily", e)
+
+
+def wait_for_settle(driver, timeout=5, quiet_ms=None, stale_ms=5000):
+    """
+    Wait (in one WebDriver round trip) until the page has been quiet for `quiet_ms`:
+    no DOM mutations and no fetch/XHR in flight. Returns a dict with
+    settled, elapsed_ms, mutations and requests. Never raises.
+    """
+    quiet_ms = config.SETTLE_QUIET_MS if quiet_ms is None else quiet_ms
+    try:
+        driver.set_script_timeout(timeout + 2)
+        result = driver.execute_async_script(SETTLE_JS, quiet_ms, int(timeout * 1000), stale_ms)
+    except Exception as e:
+        result = {"settled": False, "elapsed_ms": None, "mutations": None, "requests": None, "error": str(e)}
+    log.info("[SETTLE] %s", result)
+    return result
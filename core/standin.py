@@ -0,0 +1,258 @@
+"""
+Local stand-in for m.twitch.tv so the suite can run without the network.
+
+Serves synthetic pages for /, /search, /videos/<id> and /channel/<name> (also /<name>)
+that carry the same selectors the Screen classes rely on, with configurable latency,
+consent popups and lazy-loaded (infinite scroll) search results.
+
+    python -m core.standin --port 8000 --latency-ms 150
+"""
+import argparse
+import html
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from core import config
+
+_PAGE = """<!doctype html>
+<html lang="en"><head>
+<meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title} - Twitch</title>
+<style>
+  body {{ margin: 0; font-family: sans-serif; background: #0e0e10; color: #efeff1; }}
+  header {{ display: flex; gap: 8px; align-items: center; padding: 8px; background: #18181b; position: sticky; top: 0; }}
+  header a {{ color: #bf94ff; }}
+  main {{ padding: 8px; }}
+  .card {{ display: block; padding: 12px; margin: 8px 0; min-height: 96px; background: #1f1f23; color: inherit; text-decoration: none; border-radius: 6px; }}
+  .viewers {{ color: #adadb8; font-size: 13px; }}
+  input[type=search] {{ flex: 1; padding: 8px; font-size: 16px; }}
+  div[role=dialog] {{ position: fixed; inset: 30% 8px auto 8px; padding: 16px; background: #fff; color: #000; border-radius: 8px; z-index: 10; }}
+  video {{ width: 100%; background: #000; }}
+  .player {{ position: relative; }}
+  div[data-a-target='player-overlay-click-handler'] {{ position: absolute; inset: 0; }}
+</style>
+</head><body>
+<header><a href="/">Twitch</a>{header}</header>
+<main>{body}</main>
+<script>
+const STANDIN = {options};
+{script}
+</script>
+</body></html>
+"""
+
+_SEARCH_SCRIPT = r"""
+const main = document.querySelector('main');
+const list = document.createElement('div');
+const sentinel = document.createElement('div');
+main.append(list, sentinel);
+let term = new URLSearchParams(location.search).get('term') || '';
+let offset = 0, loading = false, done = false;
+
+async function loadMore() {
+  if (!term || loading || done) return;
+  loading = true;
+  const r = await fetch(`/api/search?term=${encodeURIComponent(term)}&offset=${offset}`);
+  const data = await r.json();
+  for (const item of data.items) {
+    const a = document.createElement('a');
+    a.className = 'card';
+    a.href = item.href;
+    a.dataset.type = item.type;
+    a.innerHTML = `<p class="title"></p><span class="viewers"></span>`;
+    a.querySelector('.title').textContent = item.title;
+    a.querySelector('.viewers').textContent = `${item.viewers.toLocaleString('en-US')} viewers`;
+    list.append(a);
+  }
+  offset += data.items.length;
+  done = !data.more;
+  loading = false;
+}
+
+const input = document.querySelector("input[type='search']");
+input.value = term;
+input.addEventListener('keydown', (e) => {
+  if (e.key !== 'Enter') return;
+  term = input.value.trim();
+  history.pushState({}, '', `/search?term=${encodeURIComponent(term)}`);
+  list.innerHTML = ''; offset = 0; done = false;
+  loadMore();
+});
+if (STANDIN.lazy) {
+  new IntersectionObserver((entries) => { if (entries[0].isIntersecting) loadMore(); }).observe(sentinel);
+}
+loadMore();
+"""
+
+_PLAYER_SCRIPT = r"""
+// Synthetic stream: a canvas painted at 30 fps, exposed as a MediaStream
+const canvas = document.createElement('canvas');
+canvas.width = 320; canvas.height = 180;
+const ctx = canvas.getContext('2d');
+let n = 0;
+setInterval(() => {
+  ctx.fillStyle = `hsl(${(n++ * 3) % 360}, 60%, 35%)`;
+  ctx.fillRect(0, 0, 320, 180);
+  ctx.fillStyle = '#fff';
+  ctx.fillText(`frame ${n}`, 10, 20);
+}, 33);
+const video = document.querySelector('video');
+video.muted = true;
+video.srcObject = canvas.captureStream(30);
+const play = () => video.play().catch(() => {});
+document.querySelector("button[aria-label='Play']").addEventListener('click', play);
+document.querySelector("div[data-a-target='player-overlay-click-handler']").addEventListener('click', play);
+
+if (STANDIN.popups) {
+  setTimeout(() => {
+    const dlg = document.createElement('div');
+    dlg.setAttribute('role', 'dialog');
+    dlg.innerHTML = '<p>Content may be intended for mature audiences.</p><button>Start Watching</button>';
+    dlg.querySelector('button').addEventListener('click', () => dlg.remove());
+    document.body.append(dlg);
+  }, STANDIN.popup_delay_ms);
+}
+"""
+
+_CONSENT_SCRIPT = r"""
+if (STANDIN.popups && !document.cookie.includes('consent=1')) {
+  const dlg = document.createElement('div');
+  dlg.setAttribute('role', 'dialog');
+  dlg.innerHTML = '<p>We use cookies.</p><button>Accept</button>';
+  dlg.querySelector('button').addEventListener('click', () => { document.cookie = 'consent=1; path=/'; dlg.remove(); });
+  document.body.append(dlg);
+}
+"""
+
+_GAMES = ("Ladder", "Pro League", "Casting", "Co-op", "Replays", "Speedrun", "Tournament", "Coaching")
+
+
+def _results(term, offset, page_size, total):
+    """Deterministic fake results: videos and channels interleaved."""
+    items = []
+    for i in range(offset, min(offset + page_size, total)):
+        label = _GAMES[i % len(_GAMES)]
+        if i % 3 == 2:
+            slug = f"{term.lower().replace(' ', '')}_{label.lower().replace(' ', '')}{i}"
+            items.append({"type": "channel", "href": f"/channel/{slug}", "title": f"{slug} — {term} {label}",
+                          "viewers": 50 + (i * 37) % 5000})
+        else:
+            items.append({"type": "video", "href": f"/videos/{1000 + i}", "title": f"{term} {label} VOD #{i + 1}",
+                          "viewers": 100 + (i * 131) % 20000})
+    return items, offset + page_size < total
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "TwitchStandin/1.0"
+
+    def log_message(self, fmt, *args):  # keep pytest output clean
+        pass
+
+    def _send(self, body, content_type="text/html; charset=utf-8", status=200):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _page(self, title, body, script="", header=""):
+        opts = self.server.options
+        self._send(_PAGE.format(title=html.escape(title), header=header, body=body,
+                                options=json.dumps(opts), script=script))
+
+    def do_GET(self):
+        opts = self.server.options
+        if opts["latency_ms"]:
+            time.sleep(opts["latency_ms"] / 1000)
+
+        url = urlparse(self.path)
+        path, query = url.path.rstrip("/") or "/", parse_qs(url.query)
+
+        if path == "/":
+            body = '<h1>Browse</h1><a class="card" href="/search">Search live channels and videos</a>'
+            return self._page("Home", body, _CONSENT_SCRIPT)
+
+        if path == "/search":
+            header = '<input type="search" aria-label="Search" placeholder="Search" autocomplete="off">'
+            return self._page("Search", "", _SEARCH_SCRIPT, header=header)
+
+        if path == "/api/search":
+            term = query.get("term", [""])[0]
+            try:
+                offset = int(query.get("offset", ["0"])[0])
+            except ValueError:
+                offset = -1
+            if offset < 0:
+                error = {"error": "offset must be a non-negative integer"}
+                return self._send(json.dumps(error), "application/json", status=400)
+            items, more = _results(term, offset, opts["page_size"], opts["total_results"])
+            return self._send(json.dumps({"items": items, "more": more}), "application/json")
+
+        if path == "/favicon.ico":
+            return self._send("", "image/x-icon", status=404)
+
+        # Anything else is a video or channel page with a player
+        name = html.escape(path.strip("/").split("/")[-1])
+        body = (
+            f'<h1>{name}</h1>'
+            '<div class="player" data-test-selector="stream-video-player__video">'
+            '<video playsinline></video>'
+            '<div data-a-target="player-overlay-click-handler"></div>'
+            '</div>'
+            '<button aria-label="Play" data-a-target="player-play-pause-button">Play</button>'
+            f'<a href="{html.escape(path)}/about">About</a>'
+        )
+        return self._page(name, body, _PLAYER_SCRIPT)
+
+
+class StandinServer:
+    """Threaded local server; `url` is the base URL to use in place of config.BASE_URL."""
+
+    def __init__(self, host="127.0.0.1", port=0, **options):
+        self.options = {**config.STANDIN_OPTIONS, **options}
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.options = self.options
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the offline Twitch-mobile stand-in pages")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=int, default=config.STANDIN_OPTIONS["latency_ms"])
+    parser.add_argument("--no-popups", action="store_true")
+    parser.add_argument("--no-lazy", action="store_true")
+    args = parser.parse_args()
+
+    server = StandinServer(port=args.port, latency_ms=args.latency_ms,
+                           popups=not args.no_popups, lazy=not args.no_lazy)
+    print(f"Stand-in serving at {server.url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
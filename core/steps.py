@@ -0,0 +1,213 @@
+"""
+Step-level execution for long UI flows.
+
+Each Screen action runs as a named step with its own timeout and retry policy. A failed
+step is retried from a checkpoint (the URL it started on) in the same browser instead of
+rerunning the whole flow, and the run aborts as soon as its total time budget is spent.
+Outcomes are kept in a decayed per-step history for flakiness scoring:
+
+    steps = StepRunner(driver, budget_s=120)
+    steps.run("search.query", lambda: search.enter_query(term), timeout=15)
+    results = steps.results
+
+Report flaky steps with:
+    python -m core.steps
+"""
+import logging
+import sys
+import time
+
+from selenium.common import InvalidSessionIdException, NoSuchWindowException, WebDriverException
+
+from core import config
+from core.json_store import JsonStore, shared_store
+
+log = logging.getLogger(__name__)
+
+# Screens turn wait timeouts into AssertionErrors; a dead session is never worth retrying
+RETRY_ON = (AssertionError, WebDriverException)
+NEVER_RETRY = (InvalidSessionIdException, NoSuchWindowException)
+
+
+class BudgetExceeded(Exception):
+    """The run's total time budget ran out before or during a step."""
+
+
+class StepTimeout(AssertionError):
+    """An attempt finished, but later than its step timeout; retryable like a wait timeout."""
+
+
+_FAILED = object()  # sentinel: the attempt raised (fn may legitimately return None)
+
+
+class StepHistory(JsonStore):
+    """Decayed per-step pass/fail/flaky rates, persisted across runs (cf. LocatorStats)."""
+
+    def __init__(self, path, alpha=None):
+        super().__init__(path)
+        self.alpha = config.STEP_HISTORY_DECAY if alpha is None else alpha
+
+    def record(self, name, passed, attempts, duration_ms, error=None):
+        a = self.alpha
+        flaky = passed and attempts > 1
+
+        def apply(data):
+            e = data.setdefault(name, {"runs": 0, "passes": 0, "flaky_passes": 0, "fail_rate": 0.0,
+                                       "flaky_rate": 0.0, "avg_ms": None, "last_error": None})
+            e["runs"] += 1
+            e["passes"] += int(passed)
+            e["flaky_passes"] += int(flaky)
+            e["fail_rate"] = round(a * (not passed) + (1 - a) * e["fail_rate"], 4)
+            e["flaky_rate"] = round(a * flaky + (1 - a) * e["flaky_rate"], 4)
+            e["avg_ms"] = duration_ms if e["avg_ms"] is None else round(a * duration_ms + (1 - a) * e["avg_ms"], 1)
+            if error:
+                e["last_error"] = error
+
+        self.update(apply)
+
+    def expected_ms(self, name):
+        e = self.data.get(name)
+        return e["avg_ms"] if e and e["avg_ms"] is not None else None
+
+
+def get_step_history():
+    """Process-wide history, saved automatically at interpreter exit."""
+    return shared_store(StepHistory, config.STEP_HISTORY_PATH)
+
+
+def _short(e):
+    text = str(e).strip().splitlines()[0] if str(e).strip() else ""
+    return f"{type(e).__name__}: {text}"[:200]
+
+
+class StepRunner:
+    def __init__(self, driver, budget_s=None, history=None):
+        self.driver = driver
+        self.budget_s = config.STEP_BUDGET_S if budget_s is None else budget_s
+        self.history = history or get_step_history()
+        self.results = []   # one dict per step: name, status, attempts, duration_ms, errors
+        self._last_error = None
+        self._t0 = time.perf_counter()
+
+    def remaining(self):
+        return self.budget_s - (time.perf_counter() - self._t0)
+
+    def _checkpoint(self):
+        try:
+            return self.driver.current_url
+        except Exception:
+            return None
+
+    def _restore(self, url, restore):
+        """Back to the state the step started from: reload its URL, then any extra setup."""
+        if url and url != "about:blank":
+            self.driver.get(url)
+        if restore:
+            restore()
+
+    def run(self, name, fn, timeout=None, retries=None, retry_on=RETRY_ON, restore=None):
+        """
+        Run `fn()` as step `name` and return its result. Page loads inside the step are capped
+        at min(timeout, remaining budget), and an attempt that still takes longer than `timeout`
+        fails with StepTimeout. Retryable failures reload the checkpoint URL (plus `restore()`)
+        and try again, up to `retries` times. Running out of the total budget, before or during
+        a step, raises BudgetExceeded.
+        """
+        timeout = timeout or config.STEP_TIMEOUT
+        retries = config.STEP_RETRIES if retries is None else retries
+        checkpoint = self._checkpoint()
+        result = {"name": name, "status": "failed", "attempts": 0, "duration_ms": 0.0, "errors": []}
+        self.results.append(result)
+        start = time.perf_counter()
+        try:
+            while True:
+                left = self.remaining()
+                if left <= 0:
+                    raise BudgetExceeded(f"Time budget of {self.budget_s:g}s spent before step '{name}'")
+                result["attempts"] += 1
+                value = self._attempt(name, fn, timeout, left)
+                if value is not _FAILED:
+                    result["status"] = "passed"
+                    return value
+                error = self._last_error
+                result["errors"].append(_short(error))
+                if not isinstance(error, retry_on) or isinstance(error, NEVER_RETRY) \
+                        or result["attempts"] > retries:
+                    raise error
+                # Fail fast when a retry cannot fit in what is left of the budget
+                expected = self.history.expected_ms(name)
+                if expected and expected / 1000 > self.remaining():
+                    log.warning("[STEP] %s: no budget left for a retry (%.0fs left, ~%.0fs needed)",
+                                name, self.remaining(), expected / 1000)
+                    raise error
+                log.warning("[STEP] %s attempt %d failed (%s); retrying from %s",
+                            name, result["attempts"], result["errors"][-1], checkpoint)
+                self._restore(checkpoint, restore)
+        except BudgetExceeded as e:
+            result["status"] = "aborted"
+            if not result["errors"] or result["errors"][-1] != _short(e):
+                result["errors"].append(_short(e))
+            raise
+        except Exception as e:
+            # Non-retryable errors and failed restores end up here too
+            if not result["errors"] or result["errors"][-1] != _short(e):
+                result["errors"].append(_short(e))
+            raise
+        finally:
+            result["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            if result["status"] != "aborted":
+                self.history.record(name, result["status"] == "passed", result["attempts"],
+                                    result["duration_ms"], result["errors"][-1] if result["errors"] else None)
+            log.info("[STEP] %s %s in %.0f ms (%d attempt%s)", name, result["status"], result["duration_ms"],
+                     result["attempts"], "" if result["attempts"] == 1 else "s")
+
+    def _attempt(self, name, fn, timeout, left):
+        """One call of `fn`; returns its value, or _FAILED with the error in self._last_error."""
+        cap = max(1, min(timeout, left))
+        capped = cap < config.PAGELOAD_TIMEOUT
+        attempt_start = time.perf_counter()
+        try:
+            if capped:
+                self.driver.set_page_load_timeout(cap)
+            value = fn()
+        except Exception as e:
+            self._last_error = e
+            return _FAILED
+        finally:
+            if capped:
+                try:
+                    self.driver.set_page_load_timeout(config.PAGELOAD_TIMEOUT)
+                except Exception:
+                    pass  # the session is gone; the step's own error says so
+        elapsed = time.perf_counter() - attempt_start
+        # A synchronous Selenium call cannot be interrupted, so overruns are judged on return
+        if self.remaining() <= 0:
+            raise BudgetExceeded(f"Time budget of {self.budget_s:g}s ran out during step '{name}'")
+        if elapsed > timeout:
+            self._last_error = StepTimeout(f"Step '{name}' took {elapsed:.1f}s (timeout {timeout}s)")
+            return _FAILED
+        return value
+
+    def summary_text(self):
+        lines = [f"[STEPS] {time.perf_counter() - self._t0:.1f}s of {self.budget_s:.0f}s budget"]
+        for r in self.results:
+            retry = f" after {r['attempts']} attempts" if r["attempts"] > 1 else ""
+            lines.append(f"    {r['name']:<22} {r['status']:<8} {r['duration_ms']:>8.0f} ms{retry}")
+        return "\n".join(lines)
+
+
+def main():
+    history = StepHistory(config.STEP_HISTORY_PATH)
+    if not history.data:
+        print(f"No step history at {history.path}")
+        return 0
+    print(f"{'step':<22} {'flaky':>6} {'fail':>6} {'avg_ms':>8} {'runs':>5}  last error")
+    ranked = sorted(history.data.items(), key=lambda kv: (-kv[1]["flaky_rate"], -kv[1]["fail_rate"]))
+    for name, e in ranked:
+        avg = "-" if e["avg_ms"] is None else f"{e['avg_ms']:.0f}"
+        print(f"{name:<22} {e['flaky_rate']:>6.2f} {e['fail_rate']:>6.2f} {avg:>8} {e['runs']:>5}  {e['last_error'] or ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
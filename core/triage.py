@@ -0,0 +1,271 @@
+"""
+Failure triage bundles.
+
+While a test runs, bounded in-memory rings keep the most recent console messages,
+raw network events and WebDriver commands. On failure they are turned into one zip,
+together with a DOM snapshot:
+
+    output/failures/<test>_<timestamp>.triage.zip
+        meta.json      url, title, error, counts
+        dom.html       document at the moment of failure
+        console.json   browser console / JS errors
+        network.har    open in Chrome DevTools (Network > Import HAR)
+        commands.json  WebDriver command timeline
+
+On a pass the rings are dropped; nothing touches the disk.
+
+What a passing test pays, and what is bounded:
+- Commands are recorded by a bare `driver.execute` wrapper (name, start, duration,
+  error): no stack walk, no payload sizing. With --instrument the full CommandRecorder
+  is reused instead.
+- Console and network events come from ChromeDriver's `browser` and `performance` logs
+  (`create_mobile_driver(..., capture_logs=True)`, Network domain only), read through
+  core.chrome_logs every `drain_every` commands: two get_log round trips per drain.
+  Events are kept as raw strings after a prefix check; JSON parsing and HAR building
+  only happen when a bundle is written.
+- This process holds at most TRIAGE_MAX_CONSOLE + TRIAGE_MAX_EVENTS + TRIAGE_MAX_COMMANDS
+  entries. ChromeDriver buffers everything logged between two drains, which for one
+  page load of a busy SPA can be thousands of events; it is emptied at the next drain.
+"""
+import json
+import logging
+import time
+import zipfile
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from pathlib import Path
+
+from core import config
+from core.chrome_logs import chrome_logs
+
+log = logging.getLogger(__name__)
+
+_NETWORK_EVENTS = {"Network.requestWillBeSent", "Network.responseReceived",
+                   "Network.loadingFinished", "Network.loadingFailed"}
+
+
+def _headers(headers):
+    return [{"name": k, "value": str(v)} for k, v in (headers or {}).items()]
+
+
+def _iso(wall_time):
+    return datetime.fromtimestamp(wall_time, tz=timezone.utc).isoformat() if wall_time else None
+
+
+def _har_entry(req, pending=False):
+    """HAR 1.2 entry from the CDP events collected for one request."""
+    response = req.get("response") or {}
+    total = ((req["end"] - req["start"]) * 1000) if req.get("end") else -1
+    timing = response.get("timing")
+    # CDP timing offsets are ms relative to requestTime
+    wait = (timing["receiveHeadersEnd"] - timing["sendEnd"]) if timing else -1
+    receive = (total - timing["receiveHeadersEnd"]) if timing and total >= 0 else -1
+    entry = {
+        "startedDateTime": _iso(req.get("wall_time")),
+        "time": round(total, 1),
+        "request": {
+            "method": req["request"].get("method", "GET"), "url": req["request"].get("url", ""),
+            "httpVersion": response.get("protocol", ""), "headers": _headers(req["request"].get("headers")),
+            "queryString": [], "cookies": [], "headersSize": -1, "bodySize": -1,
+        },
+        "response": {
+            "status": response.get("status", 0), "statusText": response.get("statusText", ""),
+            "httpVersion": response.get("protocol", ""), "headers": _headers(response.get("headers")),
+            "cookies": [], "content": {"size": req.get("encoded_bytes", 0), "mimeType": response.get("mimeType", "")},
+            "redirectURL": (response.get("headers") or {}).get("location", ""),
+            "headersSize": -1, "bodySize": req.get("encoded_bytes", -1),
+        },
+        "cache": {},
+        "timings": {"blocked": -1, "dns": -1, "connect": -1, "send": 0,
+                    "wait": round(wait, 1), "receive": round(receive, 1)},
+        "_resourceType": req.get("type"),
+    }
+    if response.get("fromDiskCache") or response.get("fromServiceWorker"):
+        entry["_fromCache"] = "disk" if response.get("fromDiskCache") else "service-worker"
+    if req.get("error"):
+        entry["_error"] = req["error"]
+    if pending:
+        entry["_pending"] = True  # still in flight at failure time: the usual suspect for timeouts
+    return entry
+
+
+def _is_network_event(message):
+    """Cheap prefix check so passing tests never JSON-parse events they will not bundle."""
+    head = message[:96]
+    return any(f'"{m}"' in head for m in _NETWORK_EVENTS)
+
+
+def build_har(events, max_pending=None):
+    """HAR 1.2 log from raw ChromeDriver performance-log messages (oldest first)."""
+    entries, pending = [], OrderedDict()   # requestId -> partial request
+    for raw in events:
+        try:
+            msg = json.loads(raw)["message"]
+        except Exception:
+            continue
+        method, params = msg.get("method"), msg.get("params", {})
+        rid = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            if params.get("redirectResponse") and rid in pending:
+                # Same requestId is reused for the redirect hop: close the previous hop first
+                hop = pending.pop(rid)
+                hop["response"], hop["end"] = params["redirectResponse"], params.get("timestamp")
+                entries.append(_har_entry(hop))
+            pending[rid] = {"request": params.get("request", {}), "type": params.get("type"),
+                            "start": params.get("timestamp"), "wall_time": params.get("wallTime")}
+            if max_pending and len(pending) > max_pending:
+                pending.popitem(last=False)
+            continue
+        req = pending.get(rid)
+        if req is None:
+            continue  # started before the ring's oldest event
+        if method == "Network.responseReceived":
+            req["response"] = params.get("response")
+            continue
+        if method not in ("Network.loadingFinished", "Network.loadingFailed"):
+            continue
+        req["end"] = params.get("timestamp")
+        if method == "Network.loadingFinished":
+            req["encoded_bytes"] = params.get("encodedDataLength", 0)
+        else:
+            req["error"] = params.get("blockedReason") or params.get("errorText") or "failed"
+        entries.append(_har_entry(pending.pop(rid)))
+    entries.extend(_har_entry(r, pending=True) for r in pending.values())
+    return {"log": {"version": "1.2", "creator": {"name": "twitch-mobile-triage", "version": "1.0"},
+                    "pages": [], "entries": entries}}
+
+
+class TriageBuffer:
+    def __init__(self, driver, recorder=None, max_console=None, max_events=None,
+                 max_commands=None, drain_every=None):
+        self.driver = driver
+        self.console = deque(maxlen=max_console or config.TRIAGE_MAX_CONSOLE)
+        self.events = deque(maxlen=max_events or config.TRIAGE_MAX_EVENTS)   # raw performance-log messages
+        self.commands = deque(maxlen=max_commands or config.TRIAGE_MAX_COMMANDS)  # (name, start, seconds, error)
+        self.drain_every = drain_every or config.TRIAGE_DRAIN_EVERY
+        self._recorder = recorder
+        self._logs = chrome_logs(driver)
+        self._orig_execute = None
+        self._since_drain = 0
+        self._draining = False
+        self._started_ms = 0
+        self._t0 = 0.0
+
+    def start(self):
+        """Begin buffering; events older than this call are ignored."""
+        self._started_ms = time.time() * 1000
+        self._t0 = time.perf_counter()
+        self._logs.subscribe("browser", self._on_console)
+        self._logs.subscribe("performance", self._on_performance)
+        if self._recorder is not None:
+            self._recorder.listeners.append(self._on_record)
+        else:
+            self._wrap_execute()
+        return self
+
+    def stop(self):
+        self._logs.unsubscribe("browser", self._on_console)
+        self._logs.unsubscribe("performance", self._on_performance)
+        if self._recorder is not None and self._on_record in self._recorder.listeners:
+            self._recorder.listeners.remove(self._on_record)
+        if self._orig_execute is not None:
+            self.driver.execute = self._orig_execute
+            self._orig_execute = None
+
+    def discard(self):
+        """Passing test: drop everything without writing."""
+        self.stop()
+        self.console.clear()
+        self.events.clear()
+        self.commands.clear()
+
+    # ---------------- collection ----------------
+    def _wrap_execute(self):
+        orig = self._orig_execute = self.driver.execute
+
+        def execute(driver_command, params=None):
+            start = time.perf_counter()
+            error = None
+            try:
+                return orig(driver_command, params)
+            except Exception as e:
+                error = type(e).__name__
+                raise
+            finally:
+                self._on_command(driver_command, start, time.perf_counter() - start, error)
+
+        self.driver.execute = execute
+
+    def _on_record(self, rec):
+        seconds = rec["duration_ms"] / 1000
+        self._on_command(rec["name"], time.perf_counter() - seconds, seconds, rec["error"])
+
+    def _on_command(self, name, start, seconds, error):
+        if self._draining:
+            return
+        self.commands.append((name, start, seconds, error))
+        self._since_drain += 1
+        if self._since_drain >= self.drain_every:
+            self.drain()
+
+    def _on_console(self, entries):
+        self.console.extend(e for e in entries if e.get("timestamp", 0) >= self._started_ms)
+
+    def _on_performance(self, entries):
+        self.events.extend(e["message"] for e in entries
+                           if e.get("timestamp", 0) >= self._started_ms and _is_network_event(e["message"]))
+
+    def drain(self):
+        """Move ChromeDriver's buffered log entries into the rings."""
+        if self._draining:
+            return
+        self._draining = True
+        self._since_drain = 0
+        try:
+            self._logs.drain()
+        finally:
+            self._draining = False
+
+    # ---------------- dump ----------------
+    def har(self):
+        return build_har(self.events, max_pending=self.events.maxlen)
+
+    def snapshot(self, error=None, **meta):
+        """Collect everything from the live browser now; returns a dict of file name -> text."""
+        self.drain()
+        self.stop()
+        drv = self.driver
+        try:
+            dom = drv.page_source
+        except Exception as e:
+            dom = f"<!-- DOM snapshot failed: {e} -->"
+        try:
+            url, title = drv.current_url, drv.title
+        except Exception:
+            url = title = None
+        har = self.har()
+        info = {**meta, "url": url, "title": title, "error": error, "captured": datetime.now().isoformat(),
+                "console": len(self.console), "requests": len(har["log"]["entries"]),
+                "in_flight": sum(1 for e in har["log"]["entries"] if e.get("_pending")),
+                "commands": len(self.commands)}
+        return {
+            "meta.json": json.dumps(info, indent=2, default=str),
+            "dom.html": dom,
+            "console.json": json.dumps(list(self.console), indent=2),
+            "network.har": json.dumps(har, indent=1),
+            "commands.json": json.dumps([
+                {"name": n, "start_ms": round((t - self._t0) * 1000, 1), "duration_ms": round(d * 1000, 1), "error": e}
+                for n, t, d, e in self.commands], indent=1),
+        }
+
+
+def write_bundle(path, files):
+    """Zip the snapshot (deflate-compressed); run on the artifact writer's thread pool."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".part")
+    with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+        for name, text in files.items():
+            zf.writestr(name, text)
+    tmp.replace(path)
+    return path
@@ -1,5 +1,7 @@
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common import TimeoutException
+from core.locator_stats import get_locator_stats
 
 def wait_visible(driver, locator, timeout=20):
     """Wait until an element located by (By, selector) is visible and return it."""
@@ -8,3 +10,70 @@ def wait_visible(driver, locator, timeout=20):
 def wait_clickable(driver, locator, timeout=20):
     """Wait until an element located by (By, selector) is clickable and return it."""
     return WebDriverWait(driver, timeout).until(EC.element_to_be_clickable(locator))
+
+
+# Polls every locator in-page and returns the first match in list order, so a whole
+# fallback chain costs one round trip and one overall timeout.
+_FIRST_MATCH_JS = r"""
+const locs = arguments[0], timeoutMs = arguments[1], clickable = arguments[2];
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+
+const candidates = (by, sel) => {
+  if (by === 'xpath') {
+    const snap = document.evaluate(sel, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const out = [];
+    for (let i = 0; i < snap.snapshotLength; i++) out.push(snap.snapshotItem(i));
+    return out;
+  }
+  return Array.from(document.querySelectorAll(sel));
+};
+const visible = (el) => {
+  const r = el.getBoundingClientRect(), cs = getComputedStyle(el);
+  return r.width > 0 && r.height > 0 && cs.visibility !== 'hidden' && cs.display !== 'none' && cs.opacity !== '0';
+};
+const usable = (el) => visible(el) && (!clickable || !(el.disabled || el.getAttribute('aria-disabled') === 'true'));
+
+// Returns [element, winnerIndex, elapsedMs, indicesThatMatchedOnTheWinningTick]
+const tick = () => {
+  let winner = null, idx = -1;
+  const matched = [];
+  for (let i = 0; i < locs.length; i++) {
+    let els = [];
+    try { els = candidates(locs[i][0], locs[i][1]); } catch (e) { continue; }  // bad selector: skip
+    const el = els.find(usable);
+    if (!el) continue;
+    matched.push(i);
+    if (!winner) { winner = el; idx = i; }
+  }
+  const elapsed = Math.round(performance.now() - start);
+  if (winner) return done([winner, idx, elapsed, matched]);
+  if (elapsed >= timeoutMs) return done([null, -1, elapsed, []]);
+  setTimeout(tick, 100);
+};
+tick();
+"""
+
+
+def wait_first(driver, locators, timeout=10, clickable=False, key=None):
+    """
+    Wait until any of the (By, selector) locators matches a visible (or clickable) element.
+    The whole list is polled in the browser by a single script; list order is priority.
+    With `key`, which locators matched is recorded in the persistent locator stats.
+    Returns (element, locator). Raises TimeoutException if nothing matched within `timeout`.
+    """
+    stats = get_locator_stats() if key else None
+    locators = list(locators)
+    for by, _ in locators:
+        if by not in ("css selector", "xpath"):
+            raise ValueError(f"wait_first supports CSS and XPath locators only, got {by!r}")
+    payload = [[by, sel] for by, sel in locators]
+    driver.set_script_timeout(timeout + 2)
+    el, idx, elapsed, matched = driver.execute_async_script(
+        _FIRST_MATCH_JS, payload, int(timeout * 1000), clickable
+    )
+    if stats:
+        stats.record(key, locators, set(matched), elapsed)
+    if el is None:
+        raise TimeoutException(f"None of {len(locators)} locators matched within {timeout}s: {locators}")
+    return el, locators[idx]
@@ -1,13 +1,17 @@
 # screens/home_screen.py
+from urllib.parse import urljoin
 from selenium.webdriver.common.by import By  # kept for future tweaks if needed
+from core import config
 
 class HomeScreen:
     def __init__(self, driver):
         self.driver = driver
+        self.base_url = None
 
     def open(self, base_url: str):
+        self.base_url = base_url
         self.driver.get(base_url)
 
     def tap_search_icon(self):
-        """Fastest & most reliable: go straight to the search route."""
-        self.driver.get("https://m.twitch.tv/search")
+        """Fastest & most reliable: go straight to the search route (live site or stand-in)."""
+        self.driver.get(urljoin(self.base_url or config.BASE_URL, "search"))
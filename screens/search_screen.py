@@ -3,7 +3,69 @@ import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.common import TimeoutException
-from core.waits import wait_clickable, wait_visible
+from core.scrolling import scroll_and_wait
+from core.settle import wait_for_settle
+from core.waits import wait_first, wait_visible
+
+# Collects result cards not returned before (marked with data-tm-pos) in one call.
+# With doScroll, scrolls to the bottom first and waits in-page for lazy-loaded cards.
+_COLLECT_RESULTS_JS = r"""
+const doScroll = arguments[0], waitMs = arguments[1];
+const done = arguments[arguments.length - 1];
+const RESERVED = new Set(['search', 'directory', 'settings', 'login', 'signup', 'downloads', 'p', 'jobs']);
+
+const kindOf = (a) => {
+  let path;
+  try { path = new URL(a.href, location.href).pathname; } catch (e) { return null; }
+  if (/\/videos?\/\d+/.test(path)) return 'video';
+  const parts = path.split('/').filter(Boolean);
+  if (parts[0] === 'channel' && parts.length === 2) return 'channel';
+  if (parts.length === 1 && !RESERVED.has(parts[0].toLowerCase())) return 'channel';
+  return null;
+};
+const viewersOf = (text) => {
+  const m = /([\d.,]+)\s*([KkMm]?)\s*viewers?/.exec(text || '');
+  if (!m) return null;
+  const n = parseFloat(m[1].replace(/,/g, ''));
+  return Math.round(n * ({ k: 1e3, m: 1e6 }[m[2].toLowerCase()] || 1));
+};
+const seenHrefs = (window.__tmSeenHrefs = window.__tmSeenHrefs || new Set());
+
+const collect = () => {
+  const out = [];
+  for (const a of document.querySelectorAll('main a[href]')) {
+    if (a.dataset.tmPos) continue;
+    const type = kindOf(a);
+    if (!type || seenHrefs.has(a.href)) continue;
+    const card = a.closest('article, li, [data-a-target*="card"], [class*="card"]') || a;
+    const text = card.innerText || '';
+    const titleEl = card.querySelector('h3, h4, [title], p');
+    seenHrefs.add(a.href);
+    a.dataset.tmPos = String(seenHrefs.size - 1);
+    out.push({
+      position: seenHrefs.size - 1,
+      href: a.href,
+      title: (a.getAttribute('title') || a.getAttribute('aria-label') ||
+              (titleEl && (titleEl.getAttribute('title') || titleEl.innerText)) || text.split('\n')[0] || '').trim(),
+      type,
+      viewers: viewersOf(text),
+    });
+  }
+  return out;
+};
+
+const first = collect();
+if (!doScroll || first.length) return done(first);
+
+window.scrollTo(0, document.documentElement.scrollHeight);
+const start = performance.now();
+const poll = () => {
+  const found = collect();
+  if (found.length || performance.now() - start >= waitMs) return done(found);
+  setTimeout(poll, 100);
+};
+poll();
+"""
 
 
 class SearchScreen:
@@ -34,32 +96,17 @@ class SearchScreen:
         self.driver = driver
 
     # ---------------- helpers ----------------
-    def _find_input(self):
-        last_err = None
-        for loc in self.INPUT_LOCATORS:
-            try:
-                return wait_visible(self.driver, loc, timeout=8)
-            except Exception as e:
-                last_err = e
-        raise last_err if last_err else AssertionError("Search input not found")
+    def _find_input(self, timeout=8):
+        # All fallbacks are polled together in-page; one overall timeout
+        try:
+            el, _ = wait_first(self.driver, self.INPUT_LOCATORS, timeout=timeout, key="search.input")
+            return el
+        except TimeoutException:
+            raise AssertionError("Search input not found")
 
     def _wait_dom_quiet(self, timeout=5):
-        """Wait briefly until DOM height stabilizes (SPA settle)."""
-        end = time.time() + timeout
-        last_h, stable = -1, 0
-        while time.time() < end:
-            try:
-                h = self.driver.execute_script("return document.body.scrollHeight||0")
-                if h == last_h:
-                    stable += 1
-                    if stable >= 3:  # ~0.6s stable (200ms × 3)
-                        return
-                else:
-                    stable = 0
-                last_h = h
-            except Exception:
-                pass
-            time.sleep(0.2)
+        """Wait until the SPA settles (no mutations / requests in flight), in one round trip."""
+        return wait_for_settle(self.driver, timeout=timeout)
 
     # ---------------- actions ----------------
     def enter_query(self, text: str):
@@ -72,52 +119,71 @@ class SearchScreen:
     def scroll_down_twice(self):
         """
         Perform exactly two smooth scrolls that are visually distinct.
-        The first scroll moves halfway, then we pause, then perform
-        a second longer scroll. This makes it look like two clear gestures.
+        Each gesture waits in-page for `scrollend` and for lazy-loaded results to render,
+        instead of sleeping. Returns the two scroll reports (offset, distance, new_items).
         """
         wait_visible(self.driver, (By.CSS_SELECTOR, "main a[href]"), timeout=10)
 
-        get_y = lambda: self.driver.execute_script("return window.pageYOffset;")
+        first = scroll_and_wait(self.driver, 0.3, item_selector="main a[href]")
+        second = scroll_and_wait(self.driver, 0.3, item_selector="main a[href]")
 
-        y0 = get_y()
-        # First scroll: half the viewport
-        self.driver.execute_script("window.scrollBy({top: window.innerHeight * 0.3, behavior: 'smooth'});")
-        time.sleep(1.2)
-        y1 = get_y()
+        print(f"[SCROLL] offsets: {first['start_offset']} -> {first['offset']} -> {second['offset']} "
+              f"(+{first['new_items'] + second['new_items']} results)")
+        return first, second
 
-        # Second scroll: full viewport
-        self.driver.execute_script("window.scrollBy({top: window.innerHeight * 0.3, behavior: 'smooth'});")
-        time.sleep(1.2)
-        y2 = get_y()
+    # ---------------- result extraction ----------------
+    def reset_results(self):
+        """Forget which cards were already returned (e.g. before a new query)."""
+        self.driver.execute_script(
+            "window.__tmSeenHrefs = new Set();"
+            "document.querySelectorAll('[data-tm-pos]').forEach(a => delete a.dataset.tmPos);"
+        )
+
+    def collect_results(self):
+        """
+        All result cards loaded so far (not yet returned) as compact records, in one script call:
+        {position, href, title, type: 'video'|'channel', viewers}.
+        """
+        self.driver.set_script_timeout(10)
+        return self.driver.execute_async_script(_COLLECT_RESULTS_JS, False, 0)
 
-        print(f"[SCROLL] offsets: {y0} -> {y1} -> {y2}")
+    def iter_results(self, target=100, max_scrolls=30, wait_ms=4000):
+        """
+        Stream result records, scrolling for more until `target` records were yielded,
+        nothing new loads within `wait_ms`, or `max_scrolls` is hit. Each round trip
+        scrolls, waits in-page for lazy-loaded cards and returns only the new ones.
+        """
+        self.driver.set_script_timeout(wait_ms / 1000 + 5)
+        yielded = 0
+        batch = self.driver.execute_async_script(_COLLECT_RESULTS_JS, False, 0)
+        for _ in range(max_scrolls + 1):
+            if not batch:
+                return
+            for record in batch:
+                yield record
+                yielded += 1
+                if yielded >= target:
+                    return
+            batch = self.driver.execute_async_script(_COLLECT_RESULTS_JS, True, wait_ms)
 
     def open_first_result(self):
         """
         Click the first VIDEO result found (fastest), otherwise first channel, otherwise any link.
         Then wait for URL to change off /search.
         """
-        # helper to click from a locator list
-        def try_click(locators):
-            for loc in locators:
-                try:
-                    el = wait_clickable(self.driver, loc, timeout=2)
-                    if not el.is_displayed():
-                        continue
-                    self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
-                    self.driver.execute_script("arguments[0].click();", el)  # JS click: bypass overlays
-                    return True
-                except Exception:
-                    continue
-            return False
-
         start_url = self.driver.current_url
 
-        # Prefer videos → then channels → then any link
-        if not try_click(self.VIDEO_LOCATORS):
-            if not try_click(self.CHANNEL_LOCATORS):
-                if not try_click(self.GENERIC_LOCATORS):
-                    raise AssertionError("No clickable search result found")
+        # Prefer videos → then channels → then any link (list order = priority, one round trip)
+        try:
+            el, _ = wait_first(
+                self.driver,
+                self.VIDEO_LOCATORS + self.CHANNEL_LOCATORS + self.GENERIC_LOCATORS,
+                timeout=6, clickable=True, key="search.result",
+            )
+        except TimeoutException:
+            raise AssertionError("No clickable search result found")
+        self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
+        self.driver.execute_script("arguments[0].click();", el)  # JS click: bypass overlays
 
         # Wait for URL to change (navigation)
         end = time.time() + 10
@@ -3,7 +3,9 @@ import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.common import TimeoutException
-from core.waits import wait_clickable, wait_visible
+from core.scrolling import scroll_and_wait
+from core.settle import wait_for_settle
+from core.waits import wait_first, wait_visible
 
 
 class SearchScreen:
@@ -34,32 +36,17 @@ class SearchScreen:
         self.driver = driver
 
     # ---------------- helpers ----------------
-    def _find_input(self):
-        last_err = None
-        for loc in self.INPUT_LOCATORS:
-            try:
-                return wait_visible(self.driver, loc, timeout=8)
-            except Exception as e:
-                last_err = e
-        raise last_err if last_err else AssertionError("Search input not found")
+    def _find_input(self, timeout=8):
+        # All fallbacks are polled together in-page; one overall timeout
+        try:
+            el, _ = wait_first(self.driver, self.INPUT_LOCATORS, timeout=timeout, key="search.input")
+            return el
+        except TimeoutException:
+            raise AssertionError("Search input not found")
 
     def _wait_dom_quiet(self, timeout=5):
-        """Wait briefly until DOM height stabilizes (SPA settle)."""
-        end = time.time() + timeout
-        last_h, stable = -1, 0
-        while time.time() < end:
-            try:
-                h = self.driver.execute_script("return document.body.scrollHeight||0")
-                if h == last_h:
-                    stable += 1
-                    if stable >= 3:  # ~0.6s stable (200ms × 3)
-                        return
-                else:
-                    stable = 0
-                last_h = h
-            except Exception:
-                pass
-            time.sleep(0.2)
+        """Wait until the SPA settles (no mutations / requests in flight), in one round trip."""
+        return wait_for_settle(self.driver, timeout=timeout)
 
     # ---------------- actions ----------------
     def enter_query(self, text: str):
@@ -72,58 +59,34 @@ class SearchScreen:
     def scroll_down_twice(self):
         """
         Issue two scroll gestures reliably without failing the test if the viewport
-        can't advance (short list / anchor). We still try to create movement via
-        up-then-down nudges, but we won't assert offsets.
+        can't advance (short list / anchor). The scroll engine nudges up first when the
+        page is already at the bottom, so a gesture still happens; we won't assert offsets.
         """
         wait_visible(self.driver, (By.CSS_SELECTOR, "main a[href]"), timeout=10)
 
-        def at_bottom():
-            return self.driver.execute_script(
-                "return (window.pageYOffset + window.innerHeight) >= (document.body.scrollHeight - 2);"
-            )
-
-        def nudge_up():
-            # create room to scroll by moving up a bit
-            self.driver.execute_script("window.scrollBy(0, -Math.round(window.innerHeight*0.3));")
-            time.sleep(0.25)
-
-        def safe_scroll_once():
-            # Try to ensure a gesture happens; if at bottom, nudge up then scroll
-            if at_bottom():
-                nudge_up()
-            self.driver.execute_script("window.scrollBy(0, Math.round(window.innerHeight*0.9));")
-            time.sleep(0.4)
-
-        # Perform exactly two gestures (no assertion)
-        safe_scroll_once()
-        safe_scroll_once()
+        # Perform exactly two gestures (no assertion); each waits in-page for scrollend + lazy loads
+        first = scroll_and_wait(self.driver, 0.9, item_selector="main a[href]", smooth=False)
+        second = scroll_and_wait(self.driver, 0.9, item_selector="main a[href]", smooth=False)
+        return first, second
 
     def open_first_result(self):
         """
         Click the first VIDEO result found (fastest), otherwise first channel, otherwise any link.
         Then wait for URL to change off /search.
         """
-        # helper to click from a locator list
-        def try_click(locators):
-            for loc in locators:
-                try:
-                    el = wait_clickable(self.driver, loc, timeout=2)
-                    if not el.is_displayed():
-                        continue
-                    self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
-                    self.driver.execute_script("arguments[0].click();", el)  # JS click: bypass overlays
-                    return True
-                except Exception:
-                    continue
-            return False
-
         start_url = self.driver.current_url
 
-        # Prefer videos → then channels → then any link
-        if not try_click(self.VIDEO_LOCATORS):
-            if not try_click(self.CHANNEL_LOCATORS):
-                if not try_click(self.GENERIC_LOCATORS):
-                    raise AssertionError("No clickable search result found")
+        # Prefer videos → then channels → then any link (list order = priority, one round trip)
+        try:
+            el, _ = wait_first(
+                self.driver,
+                self.VIDEO_LOCATORS + self.CHANNEL_LOCATORS + self.GENERIC_LOCATORS,
+                timeout=6, clickable=True, key="search.result",
+            )
+        except TimeoutException:
+            raise AssertionError("No clickable search result found")
+        self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
+        self.driver.execute_script("arguments[0].click();", el)  # JS click: bypass overlays
 
         # Wait for URL to change (navigation)
         end = time.time() + 10
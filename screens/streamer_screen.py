@@ -1,9 +1,65 @@
 # screens/streamer_screen.py
-import time
 from selenium.common import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
-from core.waits import wait_visible, wait_clickable
+from core.popups import dismissed_popups, install_popup_dismisser
+from core.settle import wait_for_settle
+from core.waits import wait_clickable, wait_first, wait_visible
+
+# Attaches media-event listeners to the <video>; safe to call repeatedly (re-arms on a new element)
+_PROBE_ARM_FN = r"""
+function armPlayProbe() {
+const v = document.querySelector('video');
+const p = window.__playProbe;
+if (p && p.video === v) return true;
+const probe = window.__playProbe = { video: v, t0: performance.now(), first: null, stalls: 0, startTime: v ? v.currentTime : 0 };
+if (!v) return false;
+const mark = () => { if (probe.first === null) probe.first = performance.now(); };
+v.addEventListener('timeupdate', () => { if (v.currentTime > probe.startTime + 0.05) mark(); });
+// Initial buffering before the first frame is startup, not a stall
+const stall = () => { if (probe.first !== null) probe.stalls++; };
+v.addEventListener('waiting', stall);
+v.addEventListener('stalled', stall);
+if (v.requestVideoFrameCallback) {
+  const onFrame = (now, meta) => { if (meta.mediaTime > probe.startTime) mark(); else v.requestVideoFrameCallback(onFrame); };
+  v.requestVideoFrameCallback(onFrame);
+}
+return true;
+}
+"""
+_PROBE_ARM_JS = _PROBE_ARM_FN + "return armPlayProbe();"
+
+# Resolves as soon as a frame is presented (or on timeout) with startup metrics
+_PROBE_AWAIT_JS = _PROBE_ARM_FN + r"""
+armPlayProbe();
+const timeoutMs = arguments[0], done = arguments[arguments.length - 1];
+const started = performance.now();
+const report = () => {
+  const pr = window.__playProbe, vid = document.querySelector('video');
+  if (!vid) return { playing: false, reason: 'no-video' };
+  let buffered = 0;
+  for (let i = 0; i < vid.buffered.length; i++) {
+    if (vid.buffered.end(i) > vid.currentTime) buffered += vid.buffered.end(i) - Math.max(vid.buffered.start(i), vid.currentTime);
+  }
+  const q = vid.getVideoPlaybackQuality ? vid.getVideoPlaybackQuality() : {};
+  return {
+    playing: pr.first !== null && !vid.paused,
+    time_to_first_frame_ms: pr.first === null ? null : Math.round(pr.first - pr.t0),
+    stalls: pr.stalls,
+    buffered_s: Math.round(buffered * 100) / 100,
+    dropped_frames: q.droppedVideoFrames ?? null,
+    total_frames: q.totalVideoFrames ?? null,
+    current_time: Math.round(vid.currentTime * 100) / 100,
+  };
+};
+const check = () => {
+  const pr = window.__playProbe;
+  if ((pr && pr.first !== null) || performance.now() - started >= timeoutMs) return done(report());
+  setTimeout(check, 50);
+};
+check();
+"""
+
 
 class StreamerScreen:
     PLAYER = (By.CSS_SELECTOR, "video, div[data-a-target='player-overlay-click-handler'], div[data-test-selector='stream-video-player__video']")
@@ -27,25 +83,28 @@ class StreamerScreen:
     def __init__(self, driver):
         self.driver = driver
 
-    def dismiss_popups_if_any(self, rounds=2):
-        for _ in range(rounds):
-            clicked = False
-            for loc in self.POPUPS:
-                try:
-                    el = wait_clickable(self.driver, loc, timeout=1)
-                    self.driver.execute_script("arguments[0].click();", el)
-                    time.sleep(0.2)
-                    clicked = True
-                except Exception:
-                    continue
-            if not clicked:
-                break
+    def dismiss_popups_if_any(self):
+        """
+        Install the in-page popup dismisser (idempotent) and return what it has clicked so far.
+        Never blocks: popups that show up later are dismissed as soon as they render.
+        """
+        try:
+            install_popup_dismisser(self.driver, self.POPUPS)
+        except Exception:
+            return []
+        dismissed = dismissed_popups(self.driver)
+        if dismissed:
+            print(f"[POPUPS] dismissed: {[d['text'] or d['locator'] for d in dismissed]}")
+        return dismissed
 
-    def wait_until_loaded(self, timeout=12):
+    def wait_until_loaded(self, timeout=12, settle_timeout=3):
+        """Wait for the player (or at least the header), then for the page to settle.
+        Returns the settle report from core.settle.wait_for_settle."""
         try:
             wait_visible(self.driver, self.PLAYER, timeout=timeout)
         except TimeoutException:
             wait_visible(self.driver, self.HEADER, timeout=timeout)
+        return wait_for_settle(self.driver, timeout=settle_timeout)
 
     def _tap_player_center(self):
         try:
@@ -58,19 +117,15 @@ class StreamerScreen:
                 const e = document.elementFromPoint(x, y);
                 if (e) e.dispatchEvent(new MouseEvent('click', {bubbles:true, cancelable:true}));
             """, el)
-            time.sleep(0.3)
         except Exception:
             pass
 
     def _press_play_buttons(self):
-        for loc in self.PLAY_OVERLAYS:
-            try:
-                el = wait_clickable(self.driver, loc, timeout=2)
-                self.driver.execute_script("arguments[0].click();", el)
-                time.sleep(0.3)
-                return
-            except Exception:
-                continue
+        try:
+            el, _ = wait_first(self.driver, self.PLAY_OVERLAYS, timeout=2, clickable=True, key="streamer.play")
+            self.driver.execute_script("arguments[0].click();", el)
+        except Exception:
+            pass
 
     def _unmute_if_present(self):
         try:
@@ -88,38 +143,46 @@ class StreamerScreen:
                 const p = v.play ? v.play() : null;
                 return true;
             """)
-            time.sleep(0.3)
             return played
         except Exception:
             return False
 
-    def _video_playing(self):
+    def _arm_playback_probe(self):
         try:
-            return self.driver.execute_script("""
-                const v = document.querySelector('video');
-                if (!v) return false;
-                return !v.paused && v.readyState >= 2;
-            """)
+            self.driver.execute_script(_PROBE_ARM_JS)
         except Exception:
-            return False
+            pass
 
-    def try_start_playback(self):
+    def probe_playback(self, timeout=3.0):
+        """
+        Wait in-page (one round trip) until video frames actually advance, or `timeout`.
+        Returns metrics: playing, time_to_first_frame_ms (from the first gesture),
+        stalls, buffered_s, dropped_frames, total_frames, current_time.
         """
-        Best-effort sequence:
+        try:
+            self.driver.set_script_timeout(timeout + 2)
+            return self.driver.execute_async_script(_PROBE_AWAIT_JS, int(timeout * 1000))
+        except Exception as e:
+            return {"playing": False, "error": str(e)}
+
+    def try_start_playback(self, timeout=4.0):
+        """
+        Best-effort sequence, stopping as soon as frames advance:
         1) Center tap (user gesture)
         2) Press overlay play button
         3) Unmute if needed
         4) Call video.play() via JS
-        5) Verify !paused & readyState
+        Between steps the media-event probe waits briefly instead of sleeping.
+        Returns the probe metrics dict (see probe_playback); metrics["playing"] is the verdict.
         """
-        self._tap_player_center()
-        self._press_play_buttons()
-        self._unmute_if_present()
-        self._js_try_play()
-
-        # Give it a moment and verify
-        for _ in range(8):
-            if self._video_playing():
-                return True
-            time.sleep(0.4)
-        return False
+        self._arm_playback_probe()
+        for step in (self._tap_player_center, self._press_play_buttons, self._unmute_if_present):
+            step()
+            if self.probe_playback(timeout=0.3).get("playing"):
+                break
+        else:
+            self._js_try_play()
+
+        metrics = self.probe_playback(timeout=timeout)
+        print(f"[PLAYBACK] {metrics}")
+        return metrics
@@ -1,22 +1,233 @@
-import os
-import time
+import json
+import logging
+import shutil
 import pytest
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
 from core import config
+from core.artifacts import capture_screenshot, get_artifact_writer, mime_type
+from core.browser_context import BrowserContext
+from core.driver_pool import DriverPool, merge_stats, stats_summary
 from core.driver_setup import create_mobile_driver
+from core.instrumentation import CommandRecorder
+from core.network_profiles import apply_network_profile
+from core.perf_capture import PerfCapture
+from core.profile_snapshot import prepare_snapshot, warm_driver_factory
 from core.logging_setup import setup_logging
+from core.paths import output_dir, worker_dirs, worker_id
+from core.standin import StandinServer
+from core.triage import TriageBuffer, write_bundle
 
-# Initialize logging once per session
+
+def pytest_addoption(parser):
+    parser.addoption("--standin", action="store_true",
+                     help="Run against the local Twitch stand-in server instead of m.twitch.tv")
+    parser.addoption("--standin-latency", type=int, default=None,
+                     help="Injected latency (ms) per stand-in response")
+    parser.addoption("--isolation", default=None, choices=("reset", "context"),
+                     help="Per-test isolation on the pooled browser (default: config.ISOLATION)")
+    parser.addoption("--network-profile", default=None, choices=sorted(config.NETWORK_PROFILES),
+                     help="Network profile for every test (default: config.NETWORK_PROFILE); "
+                          "@pytest.mark.network_profile overrides it per test")
+    parser.addoption("--perf", action="store_true",
+                     help="Capture CDP page metrics per visited page and enforce config.PERF_BUDGET")
+    parser.addoption("--instrument", action="store_true",
+                     help="Record every WebDriver command; writes output/traces/<test>.json (Chrome trace)")
+    parser.addoption("--warm-profile", action="store_true",
+                     help="Launch browsers from a clone of a primed profile (consent, caches); "
+                          "built on first use and rebuilt when stale")
+
+
+def _safe_name(nodeid):
+    return nodeid.replace("::", "__").replace("/", "_").replace("\\", "_")
+
+
+def _is_controller(config_):
+    # xdist workers get `workerinput`; the controller (or a serial run) does not
+    return not hasattr(config_, "workerinput")
+
+def _is_parallel(config_):
+    return bool(getattr(config_.option, "numprocesses", None))
+
+# Initialize logging once per session (per worker under xdist)
 def pytest_sessionstart(session):
+    if _is_controller(session.config):
+        # Drop worker folders from a previous run, parallel or not: the merge and the
+        # uploaded artifacts must only ever contain this run's files
+        for d in worker_dirs():
+            shutil.rmtree(d, ignore_errors=True)
     setup_logging()
 
+# Outcome of every test; under xdist the controller receives the workers' reports here
+_RESULTS = []
+
+def pytest_runtest_logreport(report):
+    if report.when == "call" or (report.when == "setup" and report.outcome != "passed"):
+        gateway = getattr(getattr(report, "node", None), "gateway", None)
+        _RESULTS.append({
+            "nodeid": report.nodeid,
+            "outcome": report.outcome,
+            "duration": round(report.duration, 3),
+            "worker": gateway.id if gateway else (worker_id() or "main"),
+            # record_property() values, e.g. the step outcomes and playback metrics
+            "properties": dict(report.user_properties),
+        })
+
+def pytest_sessionfinish(session, exitstatus):
+    # Background screenshot writes must land before results/logs are merged or uploaded
+    get_artifact_writer().flush()
+    if not _is_controller(session.config):
+        # The driver_pool fixture is torn down by now; hand its stats to the controller
+        session.config.workeroutput["pool_stats"] = _POOL_STATS.get(worker_id())
+        return
+
+    # One results file for the whole run, regardless of how many workers produced it
+    base = Path(config.OUTPUT_DIR)
+    base.mkdir(parents=True, exist_ok=True)
+    (base / "results.json").write_text(json.dumps(_RESULTS, indent=2, default=str), encoding="utf-8")
+
+    # Merge per-worker logs into output/test.log (a serial run already logged there)
+    dirs = worker_dirs() if _is_parallel(session.config) else []
+    if dirs:
+        for h in logging.getLogger().handlers:
+            h.flush()
+        with open(base / "test.log", "a", encoding="utf-8") as merged:
+            for d in dirs:
+                log_file = d / "test.log"
+                if log_file.exists():
+                    merged.write(log_file.read_text(encoding="utf-8", errors="replace"))
+
+# DriverPool stats per process ("main", or the xdist worker id); shown in the terminal summary
+_POOL_STATS = {}
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    # xdist controller: a worker finished and sent back its pool stats
+    stats = getattr(node, "workeroutput", {}).get("pool_stats")
+    if stats:
+        _POOL_STATS[node.gateway.id] = stats
+
+def pytest_terminal_summary(terminalreporter):
+    # Session-fixture teardown output is swallowed by --capture=sys, so the pool reports here
+    if not _POOL_STATS:
+        return
+    terminalreporter.section("driver pool")
+    for name, stats in sorted(_POOL_STATS.items()):
+        terminalreporter.write_line(f"{name:<5} {stats_summary(stats)}")
+    if len(_POOL_STATS) > 1:
+        terminalreporter.write_line(f"{'total':<5} {stats_summary(merge_stats(_POOL_STATS.values()))}")
+
+@pytest.fixture(scope="session", autouse=True)
+def standin(request):
+    """With --standin, serve local pages (one server per worker) and point BASE_URL at them."""
+    if not request.config.getoption("--standin"):
+        yield None
+        return
+    latency = request.config.getoption("--standin-latency")
+    options = {} if latency is None else {"latency_ms": latency}
+    server = StandinServer(**options).start()
+    original = config.BASE_URL
+    config.BASE_URL = server.url
+    yield server
+    config.BASE_URL = original
+    server.stop()
+
+@pytest.fixture(scope="session")
+def driver_pool(request, standin):
+    # Session scope = one warm browser per process, i.e. one per xdist worker
+    warm = request.config.getoption("--warm-profile")
+    if warm:
+        # Workers race for a lock; only the first one builds the golden profile
+        prepare_snapshot(config.DEVICE_NAME)
+    # ChromeDriver's network log feeds triage bundles and --perf request/byte counts
+    capture_logs = config.TRIAGE_BUNDLES or request.config.getoption("--perf")
+    factory = partial(warm_driver_factory if warm else create_mobile_driver, capture_logs=capture_logs)
+    pool = DriverPool(config.DEVICE_NAME, max_uses=config.POOL_MAX_USES, factory=factory, keep_cookies=warm)
+    yield pool
+    pool.close()
+    logging.getLogger(__name__).info("%s", pool.summary())
+    _POOL_STATS[worker_id() or "main"] = dict(pool.stats)
+
 @pytest.fixture
-def driver():
-    drv = create_mobile_driver(config.DEVICE_NAME)
-    yield drv
-    drv.quit()
+def driver(request, driver_pool):
+    # Warm browser from the pool; it is reset (or recycled if crashed/worn out) on release
+    log = logging.getLogger(__name__)
+    marker = request.node.get_closest_marker("network_profile")
+    # Marker beats CLI beats config default
+    profile = marker.args[0] if marker else (request.config.getoption("--network-profile") or config.NETWORK_PROFILE)
+    # Checked before a browser is checked out, so a typo cannot strand a pooled driver
+    if profile not in config.NETWORK_PROFILES:
+        raise ValueError(f"Unknown network profile {profile!r}; choose from {sorted(config.NETWORK_PROFILES)}")
+
+    drv = driver_pool.acquire()
+    context = recorder = triage = None
+    broken = False
+    try:
+        # Optionally run the test in its own browser context (separate cookies/storage/cache)
+        if (request.config.getoption("--isolation") or config.ISOLATION) == "context":
+            context = BrowserContext(drv).open()
+
+        # An unthrottled run of a "3g" test would pass with perf numbers that look valid
+        if profile != "full" and not apply_network_profile(drv, profile):
+            raise RuntimeError(f"Network profile {profile!r} could not be applied over CDP")
+
+        # WEBDRIVER_INSTRUMENT=1 attaches driver.recorder at launch; it then lives as long as the
+        # pooled browser, so it is reset here and written out per test like --instrument's
+        recorder = getattr(drv, "recorder", None)
+        if recorder:
+            recorder.reset()
+        elif request.config.getoption("--instrument"):
+            recorder = CommandRecorder(drv).attach()
+        # Console/network/command ring buffer; only written out by the failure hook below
+        triage = TriageBuffer(drv, recorder).start() if config.TRIAGE_BUNDLES else None
+        request.node._triage = triage
+    except Exception:
+        # Half-set-up browser: never hand it to the next test
+        if triage:
+            triage.discard()
+        if recorder and recorder is not getattr(drv, "recorder", None):
+            recorder.detach()
+        driver_pool.release(drv, broken=True)
+        raise
+
+    try:
+        yield drv
+    finally:
+        # Every teardown step is guarded so the driver always goes back to the pool
+        if triage:
+            triage.discard()
+        if recorder:
+            try:
+                trace = recorder.write_chrome_trace(output_dir("traces") / f"{_safe_name(request.node.nodeid)}.json")
+                logging.getLogger("webdriver").info("%s\n    trace: %s", recorder.summary_text(), trace)
+            except Exception as e:
+                log.warning("WebDriver trace not written: %s", e)
+            if recorder is getattr(drv, "recorder", None):
+                recorder.reset()  # stays attached for the browser's lifetime; keep its list per test
+            else:
+                recorder.detach()
+        try:
+            if context:
+                context.close()  # profile and other per-tab CDP state go away with the context's tab
+            elif profile != "full" and not apply_network_profile(drv, "full"):
+                # Still throttled/blocked: must not go back to the pool
+                raise RuntimeError(f"Network profile {profile!r} could not be reset")
+        except Exception as e:
+            log.warning("Driver teardown failed, recycling it: %s", e)
+            broken = True
+        driver_pool.release(drv, broken=broken)
+
+@pytest.fixture
+def perf(request, driver):
+    """Page metrics capture; a no-op unless pytest runs with --perf."""
+    capture = PerfCapture(driver, enabled=request.config.getoption("--perf")).start()
+    yield capture
+    capture.stop()
+    if capture.pages:
+        # Written next to the screenshot (per-worker output folder)
+        capture.write(output_dir() / f"perf_{_safe_name(request.node.nodeid)}.json")
 
 # Record test outcome so we can take screenshots on failure
 @pytest.hookimpl(hookwrapper=True, tryfirst=True)
@@ -30,24 +241,32 @@ def pytest_runtest_makereport(item, call):
         if drv is None:
             return
 
-        # Ensure folder
-        shots_dir = Path("output") / "failures"
-        shots_dir.mkdir(parents=True, exist_ok=True)
+        # Per worker under xdist; the file is written in the background
+        shots_dir = output_dir("failures")
 
-        # Build filename: testname_timestamp.png
+        # Build filename: testname_timestamp.<fmt>
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_name = report.nodeid.replace("::", "__").replace("/", "_").replace("\\", "_")
-        shot_path = shots_dir / f"{safe_name}_{timestamp}.png"
+        shot_path = shots_dir / f"{_safe_name(report.nodeid)}_{timestamp}"
 
         try:
-            drv.save_screenshot(str(shot_path))
-            # Try to attach to pytest-html if available
+            get_artifact_writer().save_screenshot(drv, shot_path)
+            # Try to attach a small thumbnail to pytest-html (keeps report.html light)
             try:
                 from pytest_html import extras
-                if hasattr(report, "extra"):
-                    report.extra.append(extras.image(str(shot_path)))
+                thumb, fmt = capture_screenshot(drv, fmt="jpeg", quality=config.REPORT_THUMB_QUALITY,
+                                                scale=config.REPORT_THUMB_SCALE)
+                report.extras = [*getattr(report, "extras", []), extras.image(thumb, mime_type=mime_type(fmt))]
             except Exception:
                 # Attachment failed? it's fine; the file is still saved.
                 pass
         except Exception:
             pass
+
+        # DOM, console, HAR and command timeline next to the screenshot (zipped in the background)
+        triage = getattr(item, "_triage", None)
+        if triage:
+            try:
+                files = triage.snapshot(error=report.longreprtext[-4000:], test=report.nodeid)
+                get_artifact_writer().submit_task(write_bundle, shot_path.with_name(shot_path.name + ".triage.zip"), files)
+            except Exception as e:
+                logging.getLogger(__name__).warning("Triage bundle not written: %s", e)
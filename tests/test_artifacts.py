@@ -0,0 +1,41 @@
+import base64
+
+from core.artifacts import ArtifactWriter
+
+
+class FakeCdpDriver:
+    """Answers Page.captureScreenshot with a distinct payload per call."""
+
+    def __init__(self):
+        self.shots = 0
+
+    def execute_cdp_cmd(self, cmd, params):
+        assert cmd == "Page.captureScreenshot"
+        self.shots += 1
+        return {"data": base64.b64encode(f"{params['format']} #{self.shots}".encode()).decode()}
+
+
+def test_failure_screenshots_keep_test_name_and_timestamp(tmp_path):
+    driver, writer = FakeCdpDriver(), ArtifactWriter(workers=2)
+    first = tmp_path / "tests_test_twitch_mobile.py__test_a_20260101_120000"
+    second = tmp_path / "tests_test_twitch_mobile.py__test_b_20260101_120001"
+    try:
+        writer.save_screenshot(driver, first, fmt="webp")
+        writer.save_screenshot(driver, second, fmt="webp")
+    finally:
+        writer.close()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "tests_test_twitch_mobile.py__test_a_20260101_120000.webp",
+        "tests_test_twitch_mobile.py__test_b_20260101_120001.webp",
+    ]
+    assert (tmp_path / f"{second.name}.webp").read_bytes() == b"webp #2"
+
+
+def test_image_extension_follows_the_format(tmp_path):
+    writer = ArtifactWriter(workers=1)
+    try:
+        writer.save_screenshot(FakeCdpDriver(), tmp_path / "final_view.png", fmt="jpeg")
+    finally:
+        writer.close()
+    assert [p.name for p in tmp_path.iterdir()] == ["final_view.jpeg"]
@@ -0,0 +1,73 @@
+import pytest
+
+from benchmarks.flow import compare, percentile, summarize
+from benchmarks.soak import analyze, error_rate, slope
+
+
+@pytest.mark.parametrize("pct, expected", [(50, 5), (95, 10), (99, 10), (10, 1), (11, 2)])
+def test_percentile_is_nearest_rank(pct, expected):
+    assert percentile([7, 3, 10, 1, 5, 2, 9, 4, 8, 6], pct) == expected
+
+
+def test_percentile_of_nothing():
+    assert percentile([], 50) is None
+
+
+def test_summarize():
+    assert summarize([30, 10, 20]) == {"p50": 20, "p95": 30, "p99": 30, "mean": 20.0, "min": 10, "max": 30}
+    assert summarize([]) == {"p50": None, "p95": None, "p99": None, "mean": None, "min": None, "max": None}
+
+
+def _result(steps, total):
+    return {"steps": {name: {"p50": p50, "p95": p95} for name, (p50, p95) in steps.items()},
+            "total": {"p50": total[0], "p95": total[1]}}
+
+
+def test_compare_flags_only_regressions_over_threshold():
+    baseline = _result({"open_home": (100, 200), "tap_search": (50, 80)}, (150, 280))
+    current = _result({"open_home": (125, 200), "tap_search": (50, 100), "new_step": (999, 999)}, (175, 300))
+    regressions = compare(current, baseline, threshold=0.2)
+    assert regressions == [
+        "open_home p50: 100 ms -> 125 ms (+25%)",
+        "tap_search p95: 80 ms -> 100 ms (+25%)",
+    ]
+
+
+def test_compare_within_threshold():
+    baseline = _result({"open_home": (100, 200)}, (100, 200))
+    assert compare(_result({"open_home": (110, 190)}, (110, 190)), baseline, threshold=0.2) == []
+
+
+def test_slope():
+    assert slope([]) == 0.0
+    assert slope([5]) == 0.0
+    assert slope([1, 3, 5, 7]) == pytest.approx(2.0)
+    assert slope([4, 4, 4]) == pytest.approx(0.0)
+
+
+def test_analyze_flags_growth_after_warmup():
+    samples = [{"latency_ms": 1000, "dom_nodes": 500, "js_heap_used_bytes": 10_000_000}] * 2  # warm-up spike
+    samples += [{"latency_ms": 100, "dom_nodes": 500 + 10 * i, "js_heap_used_bytes": 10_000_000}
+                for i in range(10)]
+    findings = analyze(samples, threshold=0.1, warmup=2)
+
+    assert findings["dom_nodes"]["flagged"]
+    assert findings["dom_nodes"]["start"] == pytest.approx(500)
+    assert findings["dom_nodes"]["growth"] == pytest.approx(0.18)
+    assert not findings["latency_ms"]["flagged"]
+    assert not findings["js_heap_used_bytes"]["flagged"]
+    assert "chrome_rss_bytes" not in findings  # never sampled
+
+
+def test_analyze_skips_metrics_with_too_few_samples():
+    assert analyze([{"latency_ms": 100}, {"latency_ms": 200}], threshold=0.1, warmup=0) == {}
+
+
+def test_failed_iterations_stay_out_of_the_latency_trend():
+    samples = [{"latency_ms": 1000 + 10 * i, "dom_nodes": 500} for i in range(5)]
+    samples += [{"latency_ms": 50, "dom_nodes": 500, "error": "TimeoutException: x"} for _ in range(5)]
+    findings = analyze(samples, threshold=0.1, warmup=0)
+    assert findings["latency_ms"]["start"] == pytest.approx(1000)
+    assert findings["latency_ms"]["slope_per_iter"] == pytest.approx(10)
+    assert error_rate(samples) == 0.5
+    assert error_rate([]) == 0.0
@@ -0,0 +1,28 @@
+from core.locator_stats import LocatorStats
+
+SPECIFIC = ("css selector", "input[data-a-target='tw-input']")
+BROAD = ("css selector", "input[aria-label*='earch']")
+
+
+def test_record_and_dead_selectors(tmp_path):
+    stats = LocatorStats(tmp_path / "stats.json", alpha=0.5)
+    for _ in range(5):
+        stats.record("search.input", [SPECIFIC, BROAD], {1}, 120)
+    specific, broad = (stats.data["search.input"][f"{by}|{sel}"] for by, sel in (SPECIFIC, BROAD))
+    assert (broad["hits"], broad["tries"], broad["avg_ms"]) == (5, 5, 120)
+    assert specific["hits"] == 0 and specific["avg_ms"] is None
+    assert [loc for _, loc, _ in stats.dead()] == [f"{SPECIFIC[0]}|{SPECIFIC[1]}"]
+
+
+def test_parallel_workers_merge_instead_of_overwriting(tmp_path):
+    path = tmp_path / "stats.json"
+    gw0, gw1 = LocatorStats(path), LocatorStats(path)  # both loaded before either saved
+    gw0.record("search.input", [SPECIFIC], {0}, 100)
+    gw1.record("search.input", [SPECIFIC], {0}, 100)
+    gw1.record("search.input", [SPECIFIC], set(), 6000)
+    gw0.save()
+    gw1.save()
+
+    entry = LocatorStats(path).data["search.input"][f"{SPECIFIC[0]}|{SPECIFIC[1]}"]
+    assert (entry["tries"], entry["hits"]) == (3, 2)
+    assert not list(tmp_path.glob("*.lock"))
@@ -0,0 +1,65 @@
+import pytest
+
+from core import config
+from core.matrix import _chunks, emulation_mismatch, load_matrix
+
+
+def test_load_yaml_matrix(tmp_path):
+    path = tmp_path / "matrix.yaml"
+    path.write_text("terms: [zelda, mario]\ndevices: [Pixel 5, iPhone SE]\n", encoding="utf-8")
+    assert load_matrix(path) == [("zelda", "Pixel 5"), ("mario", "Pixel 5"),
+                                 ("zelda", "iPhone SE"), ("mario", "iPhone SE")]
+
+
+def test_load_yaml_matrix_defaults_to_configured_device(tmp_path):
+    path = tmp_path / "matrix.yml"
+    path.write_text("terms: [zelda]\n", encoding="utf-8")
+    assert load_matrix(path) == [("zelda", config.DEVICE_NAME)]
+
+
+def test_load_csv_matrix(tmp_path):
+    path = tmp_path / "matrix.csv"
+    path.write_text("term,device\n zelda , Pixel 5\nmario,iPhone SE\n", encoding="utf-8")
+    assert load_matrix(path) == [("zelda", "Pixel 5"), ("mario", "iPhone SE")]
+
+
+def test_load_matrix_rejects_unknown_devices(tmp_path):
+    path = tmp_path / "matrix.csv"
+    path.write_text("term,device\nzelda,Nokia 3310\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="Nokia 3310"):
+        load_matrix(path)
+
+
+@pytest.mark.parametrize("name, text", [
+    ("matrix.yaml", "devices: [Pixel 5]\n"),
+    ("matrix.csv", "term,device\n"),
+])
+def test_load_matrix_rejects_empty_matrix(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    with pytest.raises(ValueError, match="no term × device combinations"):
+        load_matrix(path)
+
+
+def test_chunks_of_nothing():
+    assert _chunks([], 4) == []
+
+
+def test_chunks_group_by_device_and_cover_everything():
+    combos = [(t, d) for t in ("a", "b", "c") for d in ("Pixel 5", "iPhone SE")]
+    chunks = _chunks(combos, 2)
+    assert chunks == [[("a", "Pixel 5"), ("b", "Pixel 5"), ("c", "Pixel 5")],
+                      [("a", "iPhone SE"), ("b", "iPhone SE"), ("c", "iPhone SE")]]
+
+
+def test_chunks_with_more_workers_than_combos():
+    combos = [("a", "Pixel 5"), ("b", "Pixel 5")]
+    assert _chunks(combos, 4) == [[("a", "Pixel 5")], [("b", "Pixel 5")]]
+
+
+def test_emulation_mismatch():
+    p = config.DEVICE_PROFILES["Pixel 5"]
+    row = {"device": "Pixel 5", "inner_width": p["width"], "dpr": p["dpr"], "user_agent": p["ua"]}
+    assert not emulation_mismatch(row)
+    assert emulation_mismatch({**row, "dpr": 1})
+    assert not emulation_mismatch({"device": "Pixel 5", "inner_width": None})  # run failed before measuring
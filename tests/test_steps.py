@@ -0,0 +1,150 @@
+import time
+
+import pytest
+from selenium.common import InvalidSessionIdException
+
+from core import config
+from core.steps import BudgetExceeded, StepHistory, StepRunner, StepTimeout
+
+
+class FakeDriver:
+    """Just what StepRunner touches: the checkpoint URL, reloads and the page-load cap."""
+
+    def __init__(self, url="https://m.twitch.tv/search?term=x"):
+        self.current_url = url
+        self.visited = []
+        self.page_load_timeouts = []
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def set_page_load_timeout(self, seconds):
+        self.page_load_timeouts.append(seconds)
+
+
+def flaky(failures, error=AssertionError, value="ok"):
+    """A step that raises `error` `failures` times, then returns `value`."""
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise error(f"attempt {len(calls)}")
+        return value
+    fn.calls = calls
+    return fn
+
+
+@pytest.fixture
+def history(tmp_path):
+    return StepHistory(tmp_path / "history.json", alpha=0.5)
+
+
+def runner(history, budget_s=60, driver=None):
+    return StepRunner(driver or FakeDriver(), budget_s=budget_s, history=history)
+
+
+def test_passing_step_returns_value_and_records_history(history):
+    steps = runner(history)
+    assert steps.run("home.open", flaky(0), retries=1) == "ok"
+    assert steps.results[0]["status"] == "passed"
+    assert steps.results[0]["attempts"] == 1
+    entry = history.data["home.open"]
+    assert (entry["runs"], entry["passes"], entry["flaky_passes"], entry["fail_rate"]) == (1, 1, 0, 0.0)
+
+
+def test_retry_reloads_checkpoint_and_counts_as_flaky(history):
+    driver = FakeDriver()
+    restored = []
+    steps = runner(history, driver=driver)
+    fn = flaky(1)
+    assert steps.run("search.scroll", fn, retries=1, restore=lambda: restored.append(1)) == "ok"
+    assert len(fn.calls) == 2
+    assert driver.visited == [driver.current_url]
+    assert restored == [1]
+    result = steps.results[0]
+    assert (result["status"], result["attempts"]) == ("passed", 2)
+    assert result["errors"] == ["AssertionError: attempt 1"]
+    assert history.data["search.scroll"]["flaky_passes"] == 1
+    assert history.data["search.scroll"]["flaky_rate"] == 0.5
+
+
+def test_retries_exhausted_raises_last_error(history):
+    steps = runner(history)
+    fn = flaky(5)
+    with pytest.raises(AssertionError, match="attempt 3"):
+        steps.run("search.query", fn, retries=2)
+    assert len(fn.calls) == 3
+    result = steps.results[0]
+    assert (result["status"], result["attempts"]) == ("failed", 3)
+    assert len(result["errors"]) == 3
+    assert history.data["search.query"]["fail_rate"] == 0.5
+    assert history.data["search.query"]["last_error"] == "AssertionError: attempt 3"
+
+
+@pytest.mark.parametrize("error", [KeyError, InvalidSessionIdException])
+def test_non_retryable_error_is_not_retried_but_recorded(history, error):
+    steps = runner(history)
+    fn = flaky(1, error=error)
+    with pytest.raises(error):
+        steps.run("stream.load", fn, retries=3)
+    assert len(fn.calls) == 1
+    assert steps.results[0]["errors"] == [history.data["stream.load"]["last_error"]]
+    assert history.data["stream.load"]["last_error"].startswith(error.__name__)
+
+
+def test_slow_attempt_fails_with_step_timeout(history):
+    steps = runner(history)
+    with pytest.raises(StepTimeout):
+        steps.run("stream.playback", lambda: time.sleep(0.05), timeout=0.01, retries=0)
+    assert steps.results[0]["errors"][0].startswith("StepTimeout")
+
+
+def test_page_load_cap_is_restored_after_the_step(history):
+    driver = FakeDriver()
+    runner(history, driver=driver).run("home.open", flaky(0), timeout=5)
+    assert driver.page_load_timeouts == [5, config.PAGELOAD_TIMEOUT]
+
+
+def test_budget_spent_before_step(history):
+    steps = runner(history, budget_s=0)
+    fn = flaky(0)
+    with pytest.raises(BudgetExceeded, match="before step 'home.open'"):
+        steps.run("home.open", fn)
+    assert fn.calls == []
+    assert steps.results[0]["status"] == "aborted"
+    assert "home.open" not in history.data  # an abort says nothing about the step itself
+
+
+def test_budget_running_out_during_step_aborts(history):
+    steps = runner(history, budget_s=0.02)
+    with pytest.raises(BudgetExceeded, match="during step 'search.scroll'"):
+        steps.run("search.scroll", lambda: time.sleep(0.05), timeout=10, retries=3)
+    assert steps.results[0]["attempts"] == 1
+    assert steps.results[0]["status"] == "aborted"
+
+
+def test_no_retry_when_expected_duration_exceeds_budget(history):
+    history.record("search.open_result", True, 1, 120_000)
+    steps = runner(history, budget_s=30)
+    fn = flaky(1)
+    with pytest.raises(AssertionError):
+        steps.run("search.open_result", fn, retries=2)
+    assert len(fn.calls) == 1
+
+
+def test_history_round_trip_and_corrupt_file(tmp_path):
+    path = tmp_path / "history.json"
+    history = StepHistory(path, alpha=0.5)
+    history.record("home.open", True, 1, 100.0)
+    history.record("home.open", False, 2, 300.0, error="StepTimeout: slow")
+    history.save()
+
+    reloaded = StepHistory(path)
+    entry = reloaded.data["home.open"]
+    assert (entry["runs"], entry["passes"], entry["avg_ms"]) == (2, 1, 200.0)
+    assert reloaded.expected_ms("home.open") == 200.0
+    assert reloaded.expected_ms("never.ran") is None
+
+    path.write_text("{not json", encoding="utf-8")
+    assert StepHistory(path).data == {}
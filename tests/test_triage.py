@@ -0,0 +1,92 @@
+import json
+
+from core.triage import _har_entry, build_har
+
+
+def event(method, **params):
+    """A raw ChromeDriver performance-log message, as TriageBuffer keeps it."""
+    return json.dumps({"message": {"method": method, "params": params}})
+
+
+def sent(rid, url, ts, **extra):
+    return event("Network.requestWillBeSent", requestId=rid, timestamp=ts, wallTime=1_700_000_000 + ts,
+                 type="Document", request={"method": "GET", "url": url, "headers": {"Accept": "*/*"}}, **extra)
+
+
+def received(rid, status=200, **response):
+    return event("Network.responseReceived", requestId=rid,
+                 response={"status": status, "statusText": "OK", "protocol": "h2", "mimeType": "text/html",
+                           "headers": {"content-type": "text/html"}, **response})
+
+
+def entries(events, **kwargs):
+    har = build_har(events, **kwargs)
+    assert har["log"]["version"] == "1.2"
+    return har["log"]["entries"]
+
+
+def test_finished_request():
+    timing = {"sendEnd": 5.0, "receiveHeadersEnd": 45.0}
+    (e,) = entries([
+        sent("1", "https://m.twitch.tv/", 10.0),
+        received("1", timing=timing),
+        event("Network.loadingFinished", requestId="1", timestamp=10.1, encodedDataLength=2048),
+    ])
+    assert e["request"]["url"] == "https://m.twitch.tv/"
+    assert e["request"]["headers"] == [{"name": "Accept", "value": "*/*"}]
+    assert e["response"]["status"] == 200
+    assert e["response"]["httpVersion"] == "h2"
+    assert e["response"]["bodySize"] == 2048
+    assert e["time"] == 100.0
+    assert e["timings"]["wait"] == 40.0
+    assert e["timings"]["receive"] == 55.0
+    assert e["startedDateTime"].startswith("2023-11-14T")
+    assert "_pending" not in e and "_error" not in e
+
+
+def test_failed_and_pending_requests():
+    found = entries([
+        sent("1", "https://ads.example/x.js", 1.0),
+        event("Network.loadingFailed", requestId="1", timestamp=1.2, errorText="net::ERR_BLOCKED_BY_CLIENT"),
+        sent("2", "https://usher.ttvnw.net/playlist.m3u8", 2.0),
+    ])
+    failed, pending = found
+    assert failed["_error"] == "net::ERR_BLOCKED_BY_CLIENT"
+    assert pending["_pending"] is True
+    assert pending["time"] == -1
+    assert pending["request"]["url"].endswith("playlist.m3u8")
+
+
+def test_redirect_closes_previous_hop():
+    redirect = {"status": 301, "headers": {"location": "https://m.twitch.tv/"}}
+    hop, final = entries([
+        sent("1", "http://twitch.tv/", 1.0),
+        sent("1", "https://m.twitch.tv/", 1.5, redirectResponse=redirect),
+        event("Network.loadingFinished", requestId="1", timestamp=2.0, encodedDataLength=10),
+    ])
+    assert (hop["request"]["url"], hop["response"]["status"]) == ("http://twitch.tv/", 301)
+    assert hop["response"]["redirectURL"] == "https://m.twitch.tv/"
+    assert final["request"]["url"] == "https://m.twitch.tv/"
+
+
+def test_ignores_malformed_and_orphaned_events():
+    found = entries([
+        "not json",
+        event("Network.loadingFinished", requestId="gone", timestamp=1.0),  # started before the ring
+        event("Page.frameNavigated", frame={}),
+    ])
+    assert found == []
+
+
+def test_max_pending_drops_oldest():
+    found = entries([sent(str(i), f"https://m.twitch.tv/{i}", float(i)) for i in range(5)], max_pending=2)
+    assert [e["request"]["url"] for e in found] == ["https://m.twitch.tv/3", "https://m.twitch.tv/4"]
+
+
+def test_har_entry_marks_cache_hits():
+    req = {"request": {"url": "https://static.twitchcdn.net/a.js"}, "start": 1.0, "end": 1.01,
+           "response": {"status": 200, "fromDiskCache": True}}
+    e = _har_entry(req)
+    assert e["_fromCache"] == "disk"
+    assert e["request"]["method"] == "GET"
+    assert e["timings"]["wait"] == -1
@@ -1,39 +1,59 @@
-import os
 import pytest
 from core import config
+from core.artifacts import get_artifact_writer
+from core.paths import screenshot_path
+from core.steps import StepRunner
 from screens.home_screen import HomeScreen
 from screens.search_screen import SearchScreen
 from screens.streamer_screen import StreamerScreen  # used after navigation
 
-def test_search_and_capture(driver):
-    # 1) Open home
+def test_search_and_capture(driver, perf, record_property):
+    # Each action is a step: retried from the URL it started on, within one overall time budget
+    steps = StepRunner(driver)
     home = HomeScreen(driver)
-    home.open(config.BASE_URL)
+    search = SearchScreen(driver)
+    stream = StreamerScreen(driver)
 
-    # 2) Go to search
-    home.tap_search_icon()
+    def open_result():
+        start_url = driver.current_url
+        search.open_first_result()
+        final_url = driver.current_url
+        assert final_url != start_url and "/search" not in final_url, f"Expected to leave search page, got: {final_url}"
 
-    # 3) Enter query
-    search = SearchScreen(driver)
-    search.enter_query(config.SEARCH_TERM)
+    try:
+        # 1) Open home
+        steps.run("home.open", lambda: home.open(config.BASE_URL), timeout=45)
+        perf.snapshot("home")
 
-    # 4) Scroll twice (verified)
-    search.scroll_down_twice()
+        # 2) Go to search
+        steps.run("home.search", home.tap_search_icon)
 
-    # 5) Open first channel/result and verify we left /search
-    start_url = driver.current_url
-    search.open_first_result()
-    final_url = driver.current_url
-    assert final_url != start_url and "/search" not in final_url, f"Expected to leave search page, got: {final_url}"
+        # 3) Enter query
+        steps.run("search.query", lambda: search.enter_query(config.SEARCH_TERM), timeout=20)
+        perf.snapshot("search")
 
-    # 6) Handle popups, wait for load, and try to start playback (best-effort)
-    stream = StreamerScreen(driver)
-    stream.dismiss_popups_if_any()
-    stream.wait_until_loaded()
-    stream.try_start_playback()
-
-    # 7) Screenshot evidence
-    os.makedirs(os.path.dirname(config.SCREENSHOT_PATH), exist_ok=True)
-    driver.save_screenshot(config.SCREENSHOT_PATH)
-    print(f"\nScreenshot saved to: {config.SCREENSHOT_PATH}\n")
-    assert os.path.exists(config.SCREENSHOT_PATH) and os.path.getsize(config.SCREENSHOT_PATH) > 0
+        # 4) Scroll twice (verified); the checkpoint URL carries the query, so a retry reloads the results
+        steps.run("search.scroll", search.scroll_down_twice, timeout=20)
+
+        # 5) Open first channel/result and verify we left /search
+        steps.run("search.open_result", open_result, timeout=20)
+
+        # 6) Handle popups (in-page dismisser, keeps running), wait for load, and try to start playback (best-effort)
+        steps.run("stream.popups", stream.dismiss_popups_if_any, timeout=10)
+        steps.run("stream.load", stream.wait_until_loaded, timeout=20)
+        playback = steps.run("stream.playback", stream.try_start_playback, timeout=15, retries=0)
+        # Startup latency goes into the report as a metric, not just pass/fail
+        record_property("playback", playback)
+        perf.snapshot("result")
+    finally:
+        record_property("steps", steps.results)
+        print(f"\n{steps.summary_text()}")
+
+    # 7) Screenshot evidence (per-worker folder when running in parallel); written in the background
+    shot = screenshot_path()
+    _, data = get_artifact_writer().save_screenshot(driver, shot, fmt=shot.suffix.lstrip("."))
+    print(f"\nScreenshot queued to: {shot}\n")
+    assert data, "Screenshot capture returned no data"
+
+    # 8) Page performance budget (only enforced with --perf)
+    perf.assert_within_budget()